@@ -2,21 +2,289 @@
 The Module is a part of the SeleniumWise package.
 """
 import logging
-from typing import List
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
+
+from SeleniumWise.errors import ErrorPolicy, guarded
+from SeleniumWise.frame_context import frame_context
+from SeleniumWise.locator_cache import MISS, LocatorCache, ResolvingElement
+from SeleniumWise.polling import Polling, ignored, wait_until
+from SeleniumWise.scripts import (
+    FILL_FORM_SCRIPT,
+    FIND_MANY_SCRIPT,
+    SNAPSHOT_SCRIPT,
+    WAIT_SCRIPT,
+    fields_script,
+    with_atoms,
+)
+from SeleniumWise.telemetry import NO_MEASUREMENT, Telemetry, format_locator
+
+PollingArg = Union[Polling, float, None]
+
+# Conditions that both wait engines understand, as Python expected conditions.
+CONDITIONS = {
+    "present": EC.presence_of_element_located,
+    "visible": EC.visibility_of_element_located,
+    "clickable": EC.element_to_be_clickable,
+    "text": EC.text_to_be_present_in_element,
+    "value": EC.text_to_be_present_in_element_value,
+    "invisible": EC.invisibility_of_element_located,
+}
+
+# In-browser wait conditions that check visibility with the isDisplayed atom.
+_DISPLAYED_CONDITIONS = ("visible", "clickable", "invisible")
+
+# Extra seconds the script timeout must exceed an in-browser wait by.
+_SCRIPT_TIMEOUT_MARGIN = 5
 
 
 class ElementOperations:
     """
     The following methods are for the WebElement class
+
+    ``polling`` and ``ignored_exceptions`` set the defaults of every
+    wait_for_* method; each wait can override them per call. polling is a
+    Polling strategy (FixedPolling, ExponentialPolling, FastThenSlowPolling)
+    or a fixed interval in seconds, 0.5 s when omitted or 0.
+    ignored_exceptions are ignored in addition to NoSuchElementException, as
+    with WebDriverWait.
+
+    With ``wait_engine="browser"`` the presence, visibility, clickability,
+    text, value and invisibility waits are evaluated inside the page by one
+    execute_async_script call that re-checks on every DOM mutation and
+    animation frame; polling settings do not apply to them. The driver's
+    script timeout is raised when a wait needs a longer one.
+
+    With a ``telemetry`` recorder every get_element/get_elements lookup and
+    wait_for_* call records its duration, poll count, outcome and locator,
+    see Telemetry.summary(). An in-browser wait counts as a single poll and
+    a locator cache hit as none.
+
+    ``error_policy`` decides what a failing method does: log and return None
+    (the default), raise a typed SeleniumWiseError, or retry first, see
+    ErrorPolicy and abort_after_first_failure().
     """
 
-    def __init__(self, driver):
+    def __init__(
+        self,
+        driver,
+        locator_cache: Optional[LocatorCache] = None,
+        polling: PollingArg = None,
+        ignored_exceptions: Optional[Iterable[type]] = None,
+        wait_engine: str = "python",
+        telemetry: Optional[Telemetry] = None,
+        error_policy: Optional[ErrorPolicy] = None,
+    ):
+        if wait_engine not in ("python", "browser"):
+            raise ValueError(f"Unknown wait engine: {wait_engine}")
         self.driver = driver
+        self.locator_cache = locator_cache
+        self.polling = polling
+        self.ignored_exceptions = ignored_exceptions
+        self.wait_engine = wait_engine
+        self.telemetry = telemetry
+        self.error_policy = error_policy or ErrorPolicy()
+        self._script_timeout = None
+
+    def _measure(self, operation: str, locator):
+        """
+        Time an operation when telemetry is enabled
+        :param operation: operation name
+        :param locator: locator, frame index or WebElement
+        :return: context manager yielding a sample
+        """
+        if self.telemetry is None:
+            return NO_MEASUREMENT
+        return self.telemetry.measure(operation, locator)
+
+    def _wait(
+        self,
+        condition,
+        timeout: float,
+        polling: PollingArg = None,
+        ignored_exceptions: Optional[Iterable[type]] = None,
+        operation: str = "wait",
+        locator=None,
+    ):
+        """
+        Wait for a condition with the per-call or instance polling settings
+        :param condition: callable taking the driver
+        :param timeout: maximum time to wait
+        :param polling: polling strategy or interval
+        :param ignored_exceptions: exceptions ignored while polling
+        :param operation: telemetry operation name
+        :param locator: telemetry locator
+        :return: the condition's value
+        """
+        if polling is None:
+            polling = self.polling
+        if ignored_exceptions is None:
+            ignored_exceptions = self.ignored_exceptions
+        with self._measure(operation, locator) as sample:
+            return wait_until(
+                self.driver,
+                condition,
+                timeout,
+                polling,
+                ignored_exceptions,
+                on_poll=sample.poll,
+            )
+
+    @staticmethod
+    def _locator(by: tuple) -> tuple:
+        """
+        Accept both wait_for_x(LOCATOR) and wait_for_x(By.ID, 'id')
+        :param by: positional locator arguments
+        :return: (By, value)
+        """
+        return tuple(by[0]) if len(by) == 1 else tuple(by)
+
+    def _wait_for(
+        self,
+        name: str,
+        locator: tuple,
+        text: Optional[str],
+        timeout: float,
+        polling: PollingArg = None,
+        ignored_exceptions: Optional[Iterable[type]] = None,
+    ):
+        """
+        Wait for one of the CONDITIONS with the configured wait engine
+        :param name: condition name
+        :param locator: (By, value)
+        :param text: expected text for the text and value conditions
+        :param timeout: maximum time to wait
+        :param polling: polling strategy or interval (python engine)
+        :param ignored_exceptions: exceptions ignored while polling
+        :return: the condition's value
+        """
+        if self.wait_engine == "browser":
+            with self._measure("wait:" + name, locator) as sample:
+                sample.poll()
+                result = self._wait_in_browser([(name, locator, text)], "any", timeout)
+                return result["value"]
+        args = (locator, text) if name in ("text", "value") else (locator,)
+        return self._wait(
+            CONDITIONS[name](*args),
+            timeout,
+            polling,
+            ignored_exceptions,
+            "wait:" + name,
+            locator,
+        )
+
+    def _wait_in_browser(self, conditions: list, mode: str, timeout: float) -> dict:
+        """
+        Evaluate conditions inside the page with one async script round-trip
+        :param conditions: [(name, locator, text), ...]
+        :param mode: "any" or "all"
+        :param timeout: maximum time to wait in seconds
+        :return: {"index", "value"} for any, {"values"} for all
+        """
+        needed = timeout + _SCRIPT_TIMEOUT_MARGIN
+        if self._script_timeout is None or self._script_timeout < needed:
+            self.driver.set_script_timeout(needed)
+            self._script_timeout = needed
+        payload = [
+            [name, locator[0], locator[1], text] for name, locator, text in conditions
+        ]
+        script = with_atoms(
+            WAIT_SCRIPT,
+            displayed=any(name in _DISPLAYED_CONDITIONS for name, _, _ in conditions),
+        )
+        result = self.driver.execute_async_script(
+            script, payload, mode, int(timeout * 1000)
+        )
+        if result.get("error"):
+            raise WebDriverException(result["error"])
+        if result.get("timeout"):
+            raise TimeoutException(f"Timed out after {timeout}s waiting for {payload}")
+        return result
+
+    def enable_locator_cache(
+        self, max_size: int = 256, validate_interval: float = 0.5
+    ) -> LocatorCache:
+        """
+        Cache get_element/get_elements results until the DOM mutates
+        Operations of this class that change the page (click_element,
+        fill_form), and clicks, clears and keystrokes on the elements the
+        cache returns, make the next lookup check the DOM at once; changes
+        made any other way, e.g. by page scripts or through elements found
+        elsewhere, may go unnoticed for up to validate_interval seconds.
+        :param max_size: maximum number of cached locators
+        :param validate_interval: seconds between DOM generation checks, 0 to
+            check on every lookup
+        :return: LocatorCache, see LocatorCache.stats() for hit/miss counters
+        """
+        self.locator_cache = LocatorCache(self.driver, max_size, validate_interval)
+        return self.locator_cache
+
+    def disable_locator_cache(self) -> None:
+        """
+        Stop caching locator results
+        :return: None
+        """
+        self.locator_cache = None
+
+    def _find(self, kind: str, by: tuple):
+        """
+        Resolve a locator through the locator cache when enabled
+        :param kind: "element" or "elements"
+        :param by: locator
+        :return: WebElement or list of WebElements
+        """
+        if kind == "element":
+            find = self.driver.find_element
+        else:
+            find = self.driver.find_elements
+        cache = self.locator_cache
+        with self._measure("get_" + kind, self._locator(by)) as sample:
+            if cache is None:
+                sample.poll()
+                return find(*by)
+            result = cache.get(kind, by)
+            if result is MISS:
+                sample.poll()
+                result = self._resolving(kind, by, find(*by))
+                cache.put(kind, by, result)
+            return result
 
+    def _changed(self) -> None:
+        """
+        Make the locator cache re-read the document state on its next
+        lookup, after an operation that may have changed the page
+        :return: None
+        """
+        if self.locator_cache is not None:
+            self.locator_cache.revalidate()
+
+    def _resolving(self, kind: str, by: tuple, result):
+        """
+        Wrap lookup results for the cache so that they re-resolve their
+        locator when they go stale
+        :param kind: "element" or "elements"
+        :param by: locator
+        :param result: WebElement or list of WebElements
+        :return: ResolvingElement or list of ResolvingElements
+        """
+        cache = self.locator_cache
+        if kind == "element":
+            return ResolvingElement(
+                result, lambda: self.driver.find_element(*by), cache
+            )
+        return [
+            ResolvingElement(
+                element,
+                lambda index=index: self.driver.find_elements(*by)[index],
+                cache,
+            )
+            for index, element in enumerate(result)
+        ]
+
+    @guarded()
     def get_element(self, *by) -> WebElement:
         """
         Get element by locator
@@ -25,11 +293,9 @@ class ElementOperations:
         :return: WebElement
 
         """
-        try:
-            return self.driver.find_element(*by)
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._find("element", by)
 
+    @guarded()
     def get_elements(self, *by) -> WebElement:
         """
         Get elements by locator
@@ -38,11 +304,77 @@ class ElementOperations:
         :return: WebElement
 
         """
-        try:
-            return self.driver.find_elements(*by)
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._find("elements", by)
+
+    @guarded()
+    def get_elements_many(
+        self, locators: Iterable[tuple], all: bool = False
+    ) -> Dict[tuple, WebElement]:
+        """
+        Resolve many locators with a single execute_script round-trip
+        Supports css selector, xpath, id, name, class name, tag name and
+        (partial) link text. Locators already in the locator cache are served
+        from it and the rest are cached after the batch.
+        :param locators: iterable of (By, value) tuples
+        :param all: return every match (a list) instead of the first one
+        :Example: get_elements_many([(By.ID, 'user'), (By.NAME, 'password')])
+        :return: {locator: WebElement or None, or list of WebElements if all}
+        """
+        locators = [tuple(locator) for locator in locators]
+        kind = "elements" if all else "element"
+        cache = self.locator_cache
+        results = {}
+        missing = []
+        for locator in locators:
+            cached = cache.get(kind, locator) if cache is not None else MISS
+            if cached is MISS:
+                missing.append(locator)
+            else:
+                results[locator] = cached
+        if missing:
+            found = self.driver.execute_script(
+                FIND_MANY_SCRIPT, [list(locator) for locator in missing], all
+            )
+            for locator, result in zip(missing, found):
+                if cache is not None and result:
+                    result = self._resolving(kind, locator, result)
+                    cache.put(kind, locator, result)
+                results[locator] = result
+        return {locator: results[locator] for locator in locators}
+
+    @guarded()
+    def snapshot(
+        self,
+        elements_or_locator: Union[tuple, WebElement, Sequence[WebElement]],
+        fields: Sequence[str] = ("text",),
+    ) -> List[dict]:
+        """
+        Read many fields of many elements with a single execute_script call
+        Fields: text, tag_name, rect, location, size, displayed, enabled,
+        selected, attribute:<name>, dom_attribute:<name>, property:<name>
+        and css:<name>. attribute and displayed run Selenium's own atoms.
+        :param elements_or_locator: (By, value) locator resolved in the page
+            (every match), a WebElement, or a list or tuple of WebElements
+        :param fields: fields to read
+        :Example: snapshot((By.CSS_SELECTOR, 'tr'), ['text', 'attribute:id'])
+        :return: one {field: value} record per element
+        """
+        if (
+            isinstance(elements_or_locator, tuple)
+            and len(elements_or_locator) == 2
+            and isinstance(elements_or_locator[0], str)
+        ):
+            elements, locator = None, list(elements_or_locator)
+        elif isinstance(elements_or_locator, WebElement):
+            elements, locator = [elements_or_locator], None
+        else:
+            elements, locator = list(elements_or_locator), None
+        fields = list(fields)
+        return self.driver.execute_script(
+            fields_script(SNAPSHOT_SCRIPT, fields), elements, locator, fields
+        )
 
+    @guarded()
     def click_element(self, *by) -> None:
         """
         Click on element
@@ -52,250 +384,574 @@ class ElementOperations:
 
         """
         try:
-            self.get_element(*by).click()
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+            self._find("element", by).click()
+        finally:
+            self._changed()
+
+    @guarded()
+    def fill_form(
+        self, fields: Dict[tuple, Any], type_fields: Iterable[tuple] = ()
+    ) -> Dict[tuple, Union[bool, str]]:
+        """
+        Fill many form fields with a single execute_script round-trip
+        Text fields are set through the native value setter followed by
+        input and change events, so React and Vue pick the values up.
+        Selects take an option value or text (a list for multiple selects),
+        checkboxes a bool and radios a bool or the value of the radio to
+        check among the matches. Fields in type_fields are located by the
+        same script and then typed with clear() and send_keys(), after the
+        other fields.
+        :param fields: {locator: value}
+        :param type_fields: locators of fields that need real keystrokes
+        :Example: fill_form({(By.ID, 'email'): 'a@b.c', (By.ID, 'terms'): True})
+        :return: {locator: True, or an error message for fields not filled}
+        """
+        fields = {tuple(locator): value for locator, value in fields.items()}
+        typed = {tuple(locator) for locator in type_fields}
+        payload = [
+            [locator[0], locator[1], value, locator in typed]
+            for locator, value in fields.items()
+        ]
+        results = {}
+        keystrokes = []
+        try:
+            found = self.driver.execute_script(FILL_FORM_SCRIPT, payload)
+            for locator, (status, element) in zip(fields, found):
+                results[locator] = status
+                if status is True and element is not None:
+                    keystrokes.append((locator, element))
+            for locator, element in keystrokes:
+                try:
+                    element.clear()
+                    element.send_keys(str(fields[locator]))
+                except WebDriverException as error:
+                    results[locator] = error.msg or str(error)
+            for locator, status in results.items():
+                if status is not True:
+                    logging.error(f"Operation Failed: {locator}: {status}")
+            return results
+        finally:
+            self._changed()
+
+    @staticmethod
+    def _named_condition(condition) -> Optional[tuple]:
+        """
+        Parse a ("visible", LOCATOR) / ("text", LOCATOR, "text") condition
+        :param condition: condition spec
+        :return: (name, locator, text), or None for a callable condition
+        """
+        if isinstance(condition, tuple) and condition and condition[0] in CONDITIONS:
+            text = condition[2] if len(condition) > 2 else None
+            return condition[0], tuple(condition[1]), text
+        if callable(condition):
+            return None
+        raise ValueError(f"Unsupported wait condition: {condition!r}")
+
+    def _race(
+        self,
+        conditions: Sequence,
+        mode: str,
+        timeout: float,
+        polling: PollingArg,
+        ignored_exceptions: Optional[Iterable[type]],
+    ):
+        """
+        Evaluate every condition in the same polling cycle or in-page check
+        :param conditions: named condition tuples or callables
+        :param mode: "any" or "all"
+        :param timeout: maximum time to wait
+        :param polling: polling strategy or interval (python engine)
+        :param ignored_exceptions: exceptions ignored while polling
+        :return: (index, value) for any, list of values for all
+        """
+        named = [self._named_condition(condition) for condition in conditions]
+        operation = "wait:" + mode
+        locator = ", ".join(
+            format_locator(parsed[1]) if parsed else getattr(condition, "__name__", "?")
+            for condition, parsed in zip(conditions, named)
+        )
+        if self.wait_engine == "browser" and all(named):
+            with self._measure(operation, locator) as sample:
+                sample.poll()
+                result = self._wait_in_browser(named, mode, timeout)
+            if mode == "any":
+                return result["index"], result["value"]
+            return result["values"]
+        checks = []
+        for condition, parsed in zip(conditions, named):
+            if parsed is None:
+                checks.append(condition)
+            else:
+                name, by, text = parsed
+                args = (by, text) if name in ("text", "value") else (by,)
+                checks.append(CONDITIONS[name](*args))
+        if ignored_exceptions is None:
+            ignored_exceptions = self.ignored_exceptions
+        ignored_exceptions = ignored(ignored_exceptions)
+
+        def evaluate(driver):
+            values = []
+            for index, check in enumerate(checks):
+                try:
+                    value = check(driver)
+                except ignored_exceptions:
+                    value = None
+                if mode == "any" and value:
+                    return index, value
+                values.append(value)
+            if mode == "all" and all(values):
+                return values
+            return None
 
-    def wait_for_element(self, *by, timeout: int = 10) -> WebElement:
+        return self._wait(
+            evaluate, timeout, polling, ignored_exceptions, operation, locator
+        )
+
+    @guarded()
+    def wait_for_any(
+        self,
+        conditions: Sequence,
+        timeout: int = 10,
+        polling: PollingArg = None,
+        ignored_exceptions: Optional[Iterable[type]] = None,
+    ) -> Tuple[int, Any]:
+        """
+        Wait for the first of several conditions, checking all of them in
+        every polling cycle instead of one timeout after the other
+        :param conditions: ("visible" | "present" | "clickable" |
+            "invisible", LOCATOR), ("text" | "value", LOCATOR, text), or
+            callables taking the driver
+        :param timeout: maximum time to wait
+        :param polling: polling strategy or interval, instance default if omitted
+        :param ignored_exceptions: exceptions ignored while polling
+        :Example: wait_for_any([("visible", SUCCESS), ("visible", ERROR)])
+        :return: (index of the condition that fired, its value)
+        """
+        return self._race(conditions, "any", timeout, polling, ignored_exceptions)
+
+    @guarded()
+    def wait_for_all(
+        self,
+        conditions: Sequence,
+        timeout: int = 10,
+        polling: PollingArg = None,
+        ignored_exceptions: Optional[Iterable[type]] = None,
+    ) -> List[Any]:
+        """
+        Wait until every condition holds in the same polling cycle
+        :param conditions: same forms as wait_for_any
+        :param timeout: maximum time to wait
+        :param polling: polling strategy or interval, instance default if omitted
+        :param ignored_exceptions: exceptions ignored while polling
+        :return: values of the conditions, in order
+        """
+        return self._race(conditions, "all", timeout, polling, ignored_exceptions)
+
+    @guarded()
+    def wait_for_element(
+        self,
+        *by,
+        timeout: int = 10,
+        polling: PollingArg = None,
+        ignored_exceptions: Optional[Iterable[type]] = None,
+    ) -> WebElement:
         """
         Wait for element to be visible
         :param timeout:
+        :param polling: polling strategy or interval, instance default if omitted
+        :param ignored_exceptions: exceptions ignored while polling
         :param by: locator
         :Example: LOCATOR = (By.ID, 'id')
         :return: WebElement
         """
-        try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_element_located(*by)
-            )
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._wait_for(
+            "visible", self._locator(by), None, timeout, polling, ignored_exceptions
+        )
 
-    def wait_for_elements(self, *by, timeout: int = 10) -> List[WebElement]:
+    @guarded()
+    def wait_for_elements(
+        self,
+        *by,
+        timeout: int = 10,
+        polling: PollingArg = None,
+        ignored_exceptions: Optional[Iterable[type]] = None,
+    ) -> List[WebElement]:
         """
         Wait for elements to be visible
         :param timeout:
+        :param polling: polling strategy or interval, instance default if omitted
+        :param ignored_exceptions: exceptions ignored while polling
         :param by: locator
         :Example: LOCATOR = (By.ID, 'id')
         """
-        try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_all_elements_located(*by)
-            )
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._wait(
+            EC.visibility_of_all_elements_located(*by),
+            timeout,
+            polling,
+            ignored_exceptions,
+            "wait:visible_all",
+            self._locator(by),
+        )
 
-    def wait_for_element_to_be_clickable(self, *by, timeout: int = 10) -> WebElement:
+    @guarded()
+    def wait_for_element_to_be_clickable(
+        self,
+        *by,
+        timeout: int = 10,
+        polling: PollingArg = None,
+        ignored_exceptions: Optional[Iterable[type]] = None,
+    ) -> WebElement:
         """
         Wait for element to be clickable
         :param timeout: maximum time to wait
+        :param polling: polling strategy or interval, instance default if omitted
+        :param ignored_exceptions: exceptions ignored while polling
         :param by: locator
         :Example: LOCATOR = (By.ID, 'id')
         """
-        try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_clickable(*by)
-            )
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._wait_for(
+            "clickable",
+            self._locator(by),
+            None,
+            timeout,
+            polling,
+            ignored_exceptions,
+        )
 
-    def wait_for_element_to_be_invisible(self, *by, timeout: int = 10) -> WebElement:
+    @guarded()
+    def wait_for_element_to_be_invisible(
+        self,
+        *by,
+        timeout: int = 10,
+        polling: PollingArg = None,
+        ignored_exceptions: Optional[Iterable[type]] = None,
+    ) -> WebElement:
         """
         Wait for element to be invisible
         :param timeout: maximum time to wait
+        :param polling: polling strategy or interval, instance default if omitted
+        :param ignored_exceptions: exceptions ignored while polling
         :param by: locator
         :Example: LOCATOR = (By.ID, 'id')
         """
-        try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.invisibility_of_element_located(*by)
-            )
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._wait_for(
+            "invisible",
+            self._locator(by),
+            None,
+            timeout,
+            polling,
+            ignored_exceptions,
+        )
 
-    def wait_for_element_to_be_selected(self, *by, timeout: int = 10) -> WebElement:
+    @guarded()
+    def wait_for_element_to_be_selected(
+        self,
+        *by,
+        timeout: int = 10,
+        polling: PollingArg = None,
+        ignored_exceptions: Optional[Iterable[type]] = None,
+    ) -> WebElement:
         """
         Wait for element to be selected
         :param timeout: maximum time to wait
+        :param polling: polling strategy or interval, instance default if omitted
+        :param ignored_exceptions: exceptions ignored while polling
         :param by: locator
         :Example: LOCATOR = (By.ID, 'id')
         """
-        try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_selected(*by)
-            )
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._wait(
+            EC.element_to_be_selected(*by),
+            timeout,
+            polling,
+            ignored_exceptions,
+            "wait:selected",
+            by[0],
+        )
 
-    def wait_for_element_to_be_not_selected(self, *by, timeout: int = 10) -> WebElement:
+    @guarded()
+    def wait_for_element_to_be_not_selected(
+        self,
+        *by,
+        timeout: int = 10,
+        polling: PollingArg = None,
+        ignored_exceptions: Optional[Iterable[type]] = None,
+    ) -> WebElement:
         """
         Wait for element to be not selected
         :param timeout: maximum time to wait
+        :param polling: polling strategy or interval, instance default if omitted
+        :param ignored_exceptions: exceptions ignored while polling
         :param by: locator
         :Example: LOCATOR = (By.ID, 'id')
         """
-        try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.element_located_to_be_selected(*by)
-            )
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._wait(
+            EC.element_located_to_be_selected(*by),
+            timeout,
+            polling,
+            ignored_exceptions,
+            "wait:located_selected",
+            self._locator(by),
+        )
 
-    def wait_for_element_to_be_present(self, *by, timeout: int = 10) -> WebElement:
+    @guarded()
+    def wait_for_element_to_be_present(
+        self,
+        *by,
+        timeout: int = 10,
+        polling: PollingArg = None,
+        ignored_exceptions: Optional[Iterable[type]] = None,
+    ) -> WebElement:
         """
         Wait for element to be present
         :param timeout: maximum time to wait
+        :param polling: polling strategy or interval, instance default if omitted
+        :param ignored_exceptions: exceptions ignored while polling
         :param by: locator
         :Example: LOCATOR = (By.ID, 'id')
         """
-        try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located(*by)
-            )
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._wait_for(
+            "present", self._locator(by), None, timeout, polling, ignored_exceptions
+        )
 
-    def wait_for_elements_to_be_present(self, *by, timeout: int = 10) -> WebElement:
+    @guarded()
+    def wait_for_elements_to_be_present(
+        self,
+        *by,
+        timeout: int = 10,
+        polling: PollingArg = None,
+        ignored_exceptions: Optional[Iterable[type]] = None,
+    ) -> WebElement:
         """
         Wait for elements to be present
         :param timeout: maximum time to wait
+        :param polling: polling strategy or interval, instance default if omitted
+        :param ignored_exceptions: exceptions ignored while polling
         :param by: locator
         :Example: LOCATOR = (By.ID, 'id')
         """
-        try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_all_elements_located(*by)
-            )
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._wait(
+            EC.presence_of_all_elements_located(*by),
+            timeout,
+            polling,
+            ignored_exceptions,
+            "wait:present_all",
+            self._locator(by),
+        )
 
-    def wait_for_element_to_be_stale(self, *by, timeout: int = 10) -> WebElement:
+    @guarded()
+    def wait_for_element_to_be_stale(
+        self,
+        *by,
+        timeout: int = 10,
+        polling: PollingArg = None,
+        ignored_exceptions: Optional[Iterable[type]] = None,
+    ) -> WebElement:
         """
         Wait for element to be stale
         :param timeout: maximum time to wait
+        :param polling: polling strategy or interval, instance default if omitted
+        :param ignored_exceptions: exceptions ignored while polling
         :param by: locator
         :Example: LOCATOR = (By.ID, 'id')
         """
-        try:
-            return WebDriverWait(self.driver, timeout).until(EC.staleness_of(*by))
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._wait(
+            EC.staleness_of(*by),
+            timeout,
+            polling,
+            ignored_exceptions,
+            "wait:stale",
+            by[0],
+        )
 
+    @guarded()
     def wait_for_element_to_be_text_present(
-        self, *by, text: str, timeout: int = 10
+        self,
+        *by,
+        text: str,
+        timeout: int = 10,
+        polling: PollingArg = None,
+        ignored_exceptions: Optional[Iterable[type]] = None,
     ) -> WebElement:
         """
         Wait for element to be text present
         :param timeout: maximum time to wait
+        :param polling: polling strategy or interval, instance default if omitted
+        :param ignored_exceptions: exceptions ignored while polling
         :param by: locator
         :param text: text to wait for
         :Example: LOCATOR = (By.ID, 'id')
         """
-        try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.text_to_be_present_in_element(*by, text)
-            )
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._wait_for(
+            "text", self._locator(by), text, timeout, polling, ignored_exceptions
+        )
 
+    @guarded()
     def wait_for_element_to_be_text_present_in_value(
-        self, *by, text: str, timeout: int = 10
+        self,
+        *by,
+        text: str,
+        timeout: int = 10,
+        polling: PollingArg = None,
+        ignored_exceptions: Optional[Iterable[type]] = None,
     ) -> WebElement:
         """
         Wait for element to be text present in value
         :param timeout: maximum time to wait
+        :param polling: polling strategy or interval, instance default if omitted
+        :param ignored_exceptions: exceptions ignored while polling
         :param by: locator
         :param text: text to wait for
         :Example: LOCATOR = (By.ID, 'id')
         """
-        try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.text_to_be_present_in_element_value(*by, text)
-            )
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._wait_for(
+            "value", self._locator(by), text, timeout, polling, ignored_exceptions
+        )
 
-    def wait_for_element_to_be_alert_present(self, timeout: int = 10) -> WebElement:
+    @guarded()
+    def wait_for_element_to_be_alert_present(
+        self,
+        timeout: int = 10,
+        polling: PollingArg = None,
+        ignored_exceptions: Optional[Iterable[type]] = None,
+    ) -> WebElement:
         """
         Wait for element to be alert present
         :param timeout: maximum time to wait
-        """
-        try:
-            return WebDriverWait(self.driver, timeout).until(EC.alert_is_present())
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        :param polling: polling strategy or interval, instance default if omitted
+        :param ignored_exceptions: exceptions ignored while polling
+        """
+        return self._wait(
+            EC.alert_is_present(),
+            timeout,
+            polling,
+            ignored_exceptions,
+            "wait:alert",
+        )
 
+    @guarded()
     def wait_for_element_to_be_frame_available_and_switch_to_it(
-        self, *by, timeout: int = 10
+        self,
+        *by,
+        timeout: int = 10,
+        polling: PollingArg = None,
+        ignored_exceptions: Optional[Iterable[type]] = None,
     ) -> WebElement:
         """
         Wait for element to be frame available and switch to it
         :param timeout: maximum time to wait
+        :param polling: polling strategy or interval, instance default if omitted
+        :param ignored_exceptions: exceptions ignored while polling
         :param by: locator
         :Example: LOCATOR = (By.ID, 'id')
         """
-        try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.frame_to_be_available_and_switch_to_it(*by)
-            )
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        result = self._wait(
+            EC.frame_to_be_available_and_switch_to_it(*by),
+            timeout,
+            polling,
+            ignored_exceptions,
+            "wait:frame",
+            by[0],
+        )
+        frame_context(self.driver).entered(by[0])
+        return result
 
+    @guarded()
     def wait_for_element_to_be_frame_available_and_switch_to_it_by_index(
-        self, index: int, timeout: int = 10
+        self,
+        index: int,
+        timeout: int = 10,
+        polling: PollingArg = None,
+        ignored_exceptions: Optional[Iterable[type]] = None,
     ) -> WebElement:
         """
         Wait for element to be frame available and switch to it by index
         :param timeout: maximum time to wait
+        :param polling: polling strategy or interval, instance default if omitted
+        :param ignored_exceptions: exceptions ignored while polling
         :param index: index of frame
         """
-        try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.frame_to_be_available_and_switch_to_it(index)
-            )
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        result = self._wait(
+            EC.frame_to_be_available_and_switch_to_it(index),
+            timeout,
+            polling,
+            ignored_exceptions,
+            "wait:frame",
+            index,
+        )
+        frame_context(self.driver).entered(index)
+        return result
 
+    @guarded()
     def wait_for_element_to_be_frame_available_and_switch_to_it_by_webElement(
-        self, element: WebElement, timeout: int = 10
+        self,
+        element: WebElement,
+        timeout: int = 10,
+        polling: PollingArg = None,
+        ignored_exceptions: Optional[Iterable[type]] = None,
     ) -> WebElement:
         """
         Wait for element to be frame available and switch to it by webelement
         :param timeout: maximum time to wait
+        :param polling: polling strategy or interval, instance default if omitted
+        :param ignored_exceptions: exceptions ignored while polling
         :param element: webelement of frame
         """
-        try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.frame_to_be_available_and_switch_to_it(element)
-            )
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        result = self._wait(
+            EC.frame_to_be_available_and_switch_to_it(element),
+            timeout,
+            polling,
+            ignored_exceptions,
+            "wait:frame",
+            element,
+        )
+        frame_context(self.driver).entered(element)
+        return result
 
-    def wait_for_element_to_be_invisibility(self, *by, timeout: int = 10) -> WebElement:
+    @guarded()
+    def wait_for_element_to_be_invisibility(
+        self,
+        *by,
+        timeout: int = 10,
+        polling: PollingArg = None,
+        ignored_exceptions: Optional[Iterable[type]] = None,
+    ) -> WebElement:
         """
         Wait for element to be invisibility
         :param timeout: maximum time to wait
+        :param polling: polling strategy or interval, instance default if omitted
+        :param ignored_exceptions: exceptions ignored while polling
         :param by: locator
         :Example: LOCATOR = (By.ID, 'id')
         """
-        try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.invisibility_of_element_located(*by)
-            )
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._wait_for(
+            "invisible",
+            self._locator(by),
+            None,
+            timeout,
+            polling,
+            ignored_exceptions,
+        )
 
+    @guarded()
     def wait_for_element_to_be_invisibility_by_webElement(
-        self, element: WebElement, timeout: int = 10
+        self,
+        element: WebElement,
+        timeout: int = 10,
+        polling: PollingArg = None,
+        ignored_exceptions: Optional[Iterable[type]] = None,
     ) -> WebElement:
         """
         Wait for element to be invisibility by webelement
         :param timeout: maximum time to wait
+        :param polling: polling strategy or interval, instance default if omitted
+        :param ignored_exceptions: exceptions ignored while polling
         :param element: webelement
         """
-        try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.invisibility_of_element(element)
-            )
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._wait(
+            EC.invisibility_of_element(element),
+            timeout,
+            polling,
+            ignored_exceptions,
+            "wait:invisible",
+            element,
+        )
@@ -0,0 +1,296 @@
+"""
+The Module holds the SeleniumWise exceptions and the error policy deciding
+whether failures are logged, raised or retried.
+"""
+import functools
+import logging
+import threading
+import time
+import weakref
+from typing import Iterable, Optional
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+
+class SeleniumWiseError(Exception):
+    """
+    Base class of the exceptions raised by the "raise" and "retry" policies.
+    The original exception is chained as __cause__.
+    """
+
+    def __init__(self, message: str, operation: Optional[str] = None):
+        super().__init__(message)
+        self.operation = operation
+
+
+class ElementNotFoundError(SeleniumWiseError):
+    """
+    A locator did not match any element.
+    """
+
+
+class WaitTimeoutError(SeleniumWiseError):
+    """
+    A wait ran out of time.
+    """
+
+
+class NavigationError(SeleniumWiseError):
+    """
+    A Navigation operation failed.
+    """
+
+
+class NetworkTrackingError(SeleniumWiseError):
+    """
+    A NetworkTracker operation failed.
+    """
+
+
+class SessionAbortedError(SeleniumWiseError):
+    """
+    The session was aborted by an earlier failure, see
+    abort_after_first_failure().
+    """
+
+
+MODES = ("swallow", "raise", "retry")
+
+# Failures that are usually transient and worth another attempt.
+DEFAULT_RETRY_ON = (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+)
+
+
+class _Session:
+    """
+    Fail-fast state shared by every SeleniumWise object of one driver.
+    """
+
+    def __init__(self):
+        self.abort_after_first_failure = False
+        self.failure = None
+
+
+_sessions = weakref.WeakKeyDictionary()
+_sessions_lock = threading.Lock()
+
+
+def _session(driver) -> Optional[_Session]:
+    """
+    Fail-fast state of a driver
+    :param driver: WebDriver, or None for offline objects
+    :return: _Session, or None when the driver cannot be tracked
+    """
+    if driver is None:
+        return None
+    with _sessions_lock:
+        try:
+            session = _sessions.get(driver)
+            if session is None:
+                session = _sessions[driver] = _Session()
+        except TypeError:
+            return None
+        return session
+
+
+def abort_after_first_failure(driver, enabled: bool = True) -> None:
+    """
+    After the first failed operation of any SeleniumWise object using this
+    driver, make every later operation fail immediately instead of running
+    into its own timeout: "swallow" policies log and return the default,
+    the others raise SessionAbortedError
+    :param driver: WebDriver
+    :param enabled: switch fail-fast on or off
+    :return: None
+    """
+    session = _session(driver)
+    if session is not None:
+        session.abort_after_first_failure = enabled
+
+
+def session_failure(driver) -> Optional[BaseException]:
+    """
+    The failure that aborted the session
+    :param driver: WebDriver
+    :return: exception, or None while the session is healthy
+    """
+    session = _session(driver)
+    return session.failure if session is not None else None
+
+
+def reset_session(driver) -> None:
+    """
+    Forget the failure that aborted the session, e.g. between tests
+    :param driver: WebDriver
+    :return: None
+    """
+    session = _session(driver)
+    if session is not None:
+        session.failure = None
+
+
+class ErrorPolicy:
+    """
+    What a SeleniumWise method does when its operation fails.
+
+    ``swallow`` logs the error and returns None, as SeleniumWise always did.
+    ``raise`` raises a typed SeleniumWiseError. ``retry`` repeats operations
+    failing with one of ``retry_on`` up to ``retries`` times, ``retry_delay``
+    seconds apart, then raises; ``retry_budget`` caps the total number of
+    retries over the policy's lifetime so a broken page cannot multiply the
+    run time.
+    """
+
+    def __init__(
+        self,
+        mode: str = "swallow",
+        retries: int = 2,
+        retry_delay: float = 0.25,
+        retry_on: Iterable[type] = DEFAULT_RETRY_ON,
+        retry_budget: Optional[int] = None,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown error policy mode: {mode}")
+        self.mode = mode
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.retry_on = tuple(retry_on)
+        self.retry_budget = retry_budget
+        self.retries_used = 0
+        self._lock = threading.Lock()
+
+    def _may_retry(self, error: BaseException, attempt: int) -> bool:
+        """
+        Whether a failed attempt gets another one, consuming the budget
+        :param error: the failure
+        :param attempt: attempts made so far
+        :return: bool
+        """
+        if self.mode != "retry" or attempt > self.retries:
+            return False
+        if not isinstance(error, self.retry_on):
+            return False
+        with self._lock:
+            if self.retry_budget is not None and self.retries_used >= self.retry_budget:
+                return False
+            self.retries_used += 1
+        return True
+
+    def call(
+        self,
+        driver,
+        operation: str,
+        error_type: type,
+        default,
+        function,
+        *args,
+        soft: tuple = (),
+        **kwargs,
+    ):
+        """
+        Run an operation under this policy
+        :param driver: WebDriver whose session shares the fail-fast state
+        :param operation: operation name for messages
+        :param error_type: SeleniumWiseError subclass for other failures
+        :param default: value returned when a failure is swallowed
+        :param function: the operation
+        :param soft: exception types that are a documented outcome of the
+            operation, e.g. a wait returning False on timeout; they never
+            abort the session and are only logged at DEBUG when swallowed
+        :return: the operation's value, or default
+        """
+        session = _session(driver)
+        if session is not None and session.failure is not None:
+            aborted = SessionAbortedError(
+                f"{operation} skipped, session aborted by: {session.failure}",
+                operation,
+            )
+            if self.mode == "swallow":
+                logging.error(f"Operation Failed: {aborted}")
+                return default
+            raise aborted from session.failure
+        attempt = 1
+        while True:
+            try:
+                return function(*args, **kwargs)
+            except Exception as error:
+                if self._may_retry(error, attempt):
+                    attempt += 1
+                    time.sleep(self.retry_delay)
+                    continue
+                if (
+                    session is not None
+                    and session.abort_after_first_failure
+                    and session.failure is None
+                    and not isinstance(error, soft)
+                ):
+                    session.failure = error
+                if self.mode == "swallow":
+                    if isinstance(error, soft):
+                        logging.debug(f"{operation}: {error}")
+                    else:
+                        logging.error(f"Operation Failed: {error}")
+                    return default
+                if isinstance(error, SeleniumWiseError):
+                    raise
+                raise _translate(error, operation, error_type) from error
+
+
+def _translate(
+    error: BaseException, operation: str, error_type: type
+) -> SeleniumWiseError:
+    """
+    Typed exception for a failure
+    :param error: the failure
+    :param operation: operation name
+    :param error_type: fallback SeleniumWiseError subclass
+    :return: SeleniumWiseError
+    """
+    if isinstance(error, TimeoutException):
+        error_type = WaitTimeoutError
+    elif isinstance(error, NoSuchElementException):
+        error_type = ElementNotFoundError
+    message = getattr(error, "msg", None) or str(error) or type(error).__name__
+    return error_type(f"{operation} failed: {message}", operation)
+
+
+def guarded(error_type: type = SeleniumWiseError, default=None, soft: tuple = ()):
+    """
+    Run a method under its object's error_policy instead of a try/except
+    :param error_type: SeleniumWiseError subclass raised for failures that
+        are neither timeouts nor missing elements
+    :param default: value returned when a failure is swallowed
+    :param soft: exception types the method documents as a normal outcome,
+        which do not abort the session or log an error, see
+        ErrorPolicy.call()
+    :return: decorator
+    """
+
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            return self.error_policy.call(
+                self.driver,
+                method.__name__,
+                error_type,
+                default,
+                method,
+                self,
+                *args,
+                soft=soft,
+                **kwargs,
+            )
+
+        return wrapper
+
+    return decorate
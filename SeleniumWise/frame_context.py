@@ -0,0 +1,270 @@
+"""
+The Module tracks the active frame of a driver to skip redundant switches.
+"""
+import weakref
+from contextlib import contextmanager
+from typing import Optional, Sequence, Union
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    NoSuchFrameException,
+    StaleElementReferenceException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+
+FrameReference = Union[int, str, tuple, WebElement]
+
+_contexts = weakref.WeakKeyDictionary()
+
+
+def frame_context(driver) -> "FrameContext":
+    """
+    The FrameContext shared by every SeleniumWise object of a driver
+    :param driver: WebDriver
+    :return: FrameContext
+    """
+    context = _contexts.get(driver)
+    if context is None:
+        context = _contexts[driver] = FrameContext(driver)
+    return context
+
+
+class FrameContext:
+    """
+    Remembers the frame path the driver is switched to, as the list of
+    references used to enter each frame from the top-level document.
+
+    switch_to_path() only issues the parent_frame/frame commands needed to
+    get from the current path to the target one, nothing when both are the
+    same. Frames referenced by locator, id or name are resolved once per
+    path and the WebElement reused, so entering them again costs a single
+    frame command. A switch made directly on the driver is not seen; call
+    forget() after one so the next switch starts from the top-level
+    document. Navigation.switch_to_default_content() always sends its
+    command for the same reason.
+
+    ``epoch`` grows on every change of the browsing context seen here:
+    frame switches, and the navigations and window switches that call
+    reset(). The locator cache compares it to notice them without a
+    round-trip.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.epoch = 0
+        self.switches = 0
+        self.skipped = 0
+        self._path = []
+        self._known = True
+        self._elements = {}
+
+    @property
+    def path(self) -> Optional[tuple]:
+        """
+        Current frame path, () for the top-level document
+        :return: tuple of references, or None when unknown
+        """
+        return tuple(self._path) if self._known else None
+
+    def reset(self, clear_cache: bool = True) -> None:
+        """
+        Record that the driver is at the top-level document, e.g. after a
+        navigation or a window switch
+        :param clear_cache: forget the resolved frame elements too
+        :return: None
+        """
+        self._path = []
+        self._known = True
+        self.epoch += 1
+        if clear_cache:
+            self._elements.clear()
+
+    def entered(self, reference: FrameReference) -> None:
+        """
+        Record a switch into a child frame made by someone else, e.g. by
+        EC.frame_to_be_available_and_switch_to_it
+        :param reference: frame reference
+        :return: None
+        """
+        if self._known:
+            self._path.append(_key(reference))
+        self.epoch += 1
+
+    def _resolve(self, reference: FrameReference, refresh: bool = False):
+        """
+        Turn a reference into something switch_to.frame takes in one command
+        :param reference: index, id or name, locator or WebElement
+        :param refresh: ignore the cached element
+        :return: int or WebElement
+        """
+        if isinstance(reference, (int, WebElement)):
+            return reference
+        key = (tuple(self._path), _key(reference))
+        element = None if refresh else self._elements.get(key)
+        if element is None:
+            if isinstance(reference, str):
+                try:
+                    element = self.driver.find_element(By.ID, reference)
+                except NoSuchElementException:
+                    elements = self.driver.find_elements(By.NAME, reference)
+                    if not elements:
+                        raise NoSuchFrameException(reference)
+                    element = elements[0]
+            else:
+                element = self.driver.find_element(*reference)
+            self._elements[key] = element
+        return element
+
+    def _enter(self, reference: FrameReference) -> None:
+        """
+        Switch into a child frame of the current one
+        :param reference: frame reference
+        :return: None
+        """
+        try:
+            self.driver.switch_to.frame(self._resolve(reference))
+        except (StaleElementReferenceException, NoSuchFrameException):
+            if isinstance(reference, (int, WebElement)):
+                raise
+            self.driver.switch_to.frame(self._resolve(reference, refresh=True))
+        self.switches += 1
+        self.epoch += 1
+        self._path.append(_key(reference))
+
+    def switch_to_frame(self, reference: FrameReference) -> None:
+        """
+        Switch into a child frame of the current frame
+        :param reference: index, id or name, locator or WebElement
+        :return: None
+        """
+        try:
+            self._enter(reference)
+        except Exception:
+            self.forget()
+            raise
+
+    def switch_to_default_content(self, force: bool = False) -> None:
+        """
+        Switch to the top-level document unless already there
+        :param force: send the command even when the recorded path is the
+            top-level document, in case the driver was switched elsewhere
+        :return: None
+        """
+        if not force and self._known and not self._path:
+            self.skipped += 1
+            return
+        self.driver.switch_to.default_content()
+        self.switches += 1
+        self.reset(clear_cache=False)
+
+    def switch_to_parent_frame(self) -> None:
+        """
+        Switch to the parent frame, a no-op in the top-level document
+        :return: None
+        """
+        if self._known and not self._path:
+            self.skipped += 1
+            return
+        self.driver.switch_to.parent_frame()
+        self.switches += 1
+        self.epoch += 1
+        if self._known:
+            self._path.pop()
+
+    def switch_to_path(self, path: Sequence[FrameReference]) -> None:
+        """
+        Switch to a frame given by its path from the top-level document,
+        with the fewest commands from the current frame
+        :param path: references of the frames to enter, outermost first
+        :Example: switch_to_path([(By.ID, 'checkout'), 'card-number'])
+        :return: None
+        """
+        target = [_key(reference) for reference in path]
+        if self._known and self._path == target:
+            self.skipped += 1
+            return
+        try:
+            common = 0
+            if self._known:
+                while (
+                    common < min(len(self._path), len(target))
+                    and self._path[common] == target[common]
+                ):
+                    common += 1
+            up = len(self._path) - common
+            if not self._known or up > 1 + common:
+                self.driver.switch_to.default_content()
+                self.switches += 1
+                self.reset(clear_cache=False)
+                common = 0
+            else:
+                for _ in range(up):
+                    self.driver.switch_to.parent_frame()
+                    self.switches += 1
+                    self.epoch += 1
+                    self._path.pop()
+            for reference in path[common:]:
+                self._enter(reference)
+        except Exception:
+            self.forget()
+            raise
+
+    def forget(self) -> None:
+        """
+        Record that the driver is in an unknown frame, e.g. after a failed
+        switch or one made directly on the driver
+        :return: None
+        """
+        self._known = False
+        self.epoch += 1
+
+    @contextmanager
+    def frame(self, path: Sequence[FrameReference]):
+        """
+        Work inside a frame and switch back to the previous one afterwards
+        :param path: references of the frames to enter, outermost first
+        :Example: with context.frame([(By.ID, 'editor')]): ...
+        :return: context manager
+        """
+        previous = self.path
+        self.switch_to_path(path)
+        try:
+            yield self
+        finally:
+            if previous is None:
+                self.switch_to_default_content()
+            else:
+                self.switch_to_path(previous)
+
+    def find_element(self, path: Sequence[FrameReference], *by) -> WebElement:
+        """
+        Find an element inside a (nested) frame, switching only if needed
+        :param path: references of the frames to enter, outermost first
+        :param by: locator
+        :return: WebElement
+        """
+        self.switch_to_path(path)
+        return self.driver.find_element(*by)
+
+    def stats(self) -> dict:
+        """
+        Switch counters
+        :return: dict
+        """
+        return {
+            "switches": self.switches,
+            "skipped": self.skipped,
+            "cached_frames": len(self._elements),
+        }
+
+
+def _key(reference: FrameReference):
+    """
+    Hashable form of a frame reference
+    :param reference: frame reference
+    :return: the reference, lists turned into tuples
+    """
+    if isinstance(reference, list):
+        return tuple(reference)
+    return reference
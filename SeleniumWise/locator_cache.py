@@ -0,0 +1,204 @@
+"""
+The Module holds the locator result cache used by ElementOperations.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webelement import WebElement
+
+from SeleniumWise.frame_context import frame_context
+
+# Installs a MutationObserver that bumps a generation counter on every DOM
+# mutation. The random token identifies the document, so a navigation or a
+# switch to another frame or window never reuses results of a different one.
+_GENERATION_SCRIPT = """
+var state = window.__seleniumWiseDom;
+if (!state) {
+    state = window.__seleniumWiseDom = {
+        token: Date.now().toString(36) + Math.random().toString(36).slice(2),
+        generation: 0
+    };
+    new MutationObserver(function () { state.generation++; }).observe(
+        document,
+        {childList: true, subtree: true, attributes: true, characterData: true}
+    );
+}
+return [state.token, state.generation];
+"""
+
+MISS = object()
+
+# Element commands after which the page may have changed.
+_MUTATING_COMMANDS = frozenset(
+    (Command.CLICK_ELEMENT, Command.CLEAR_ELEMENT, Command.SEND_KEYS_TO_ELEMENT)
+)
+
+
+class ResolvingElement(WebElement):
+    """
+    WebElement handed out by the locator cache. A command failing because
+    the element went stale re-resolves its locator once and is retried on
+    the fresh element, so callers never see a stale cached element. Clicks,
+    clears and keystrokes make the cache re-read the document state on its
+    next lookup.
+    """
+
+    def __init__(
+        self,
+        element: WebElement,
+        resolve: Callable[[], WebElement],
+        cache: Optional["LocatorCache"] = None,
+    ):
+        super().__init__(element.parent, element.id)
+        self._resolve = resolve
+        self._cache = cache
+
+    def _execute(self, command, params=None):
+        try:
+            return self._retrying(command, params)
+        finally:
+            if self._cache is not None and command in _MUTATING_COMMANDS:
+                self._cache.revalidate()
+
+    def _retrying(self, command, params):
+        try:
+            return super()._execute(command, params)
+        except StaleElementReferenceException as error:
+            try:
+                fresh = self._resolve()
+            except Exception:
+                raise error
+            self._id = fresh.id
+            return super()._execute(command, params)
+
+
+class LocatorCache:
+    """
+    LRU cache of find_element(s) results keyed by document and locator.
+
+    The document token and mutation generation are read with one script call
+    at most every ``validate_interval`` seconds; within that window hits cost
+    no round-trip at all, so a mutation may go unnoticed for up to that long.
+    The interval trades freshness for round-trips only for changes the
+    ElementOperations do not make themselves: their clicks and form fills,
+    and clicks, clears and keystrokes on the elements this cache hands out,
+    call revalidate(). Use ``validate_interval=0`` to check on every lookup.
+    Navigations, window and frame switches made through SeleniumWise are
+    noticed at once: they bump the driver's FrameContext epoch, which forces
+    a check.
+    """
+
+    def __init__(self, driver, max_size: int = 256, validate_interval: float = 0.5):
+        self.driver = driver
+        self.max_size = max_size
+        self.validate_interval = validate_interval
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._state = None
+        self._validated_at = None
+        self._epoch = None
+
+    def _document(self) -> tuple:
+        """
+        Current document token and generation, re-read when due or when the
+        browsing context changed
+        :return: (token, generation)
+        """
+        now = time.monotonic()
+        epoch = frame_context(self.driver).epoch
+        if (
+            self._state is None
+            or self._validated_at is None
+            or self._epoch != epoch
+            or now - self._validated_at >= self.validate_interval
+        ):
+            self._state = tuple(self.driver.execute_script(_GENERATION_SCRIPT))
+            self._validated_at = now
+            self._epoch = epoch
+        return self._state
+
+    def get(self, kind: str, locator: tuple) -> Any:
+        """
+        Look up a cached result
+        :param kind: "element" or "elements"
+        :param locator: (By, value)
+        :return: cached result or MISS
+        """
+        token, generation = self._document()
+        key = (token, kind) + tuple(locator)
+        cached = self._entries.get(key)
+        if cached is not None and cached[0] == generation:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return cached[1]
+        if cached is not None:
+            del self._entries[key]
+            self.invalidations += 1
+        self.misses += 1
+        return MISS
+
+    def put(self, kind: str, locator: tuple, result: Any) -> None:
+        """
+        Store a lookup result for the current document generation
+        Empty results are not stored, so an element that appears is found
+        by the next lookup.
+        :param kind: "element" or "elements"
+        :param locator: (By, value)
+        :param result: WebElement or list of WebElements
+        :return: None
+        """
+        if not result:
+            return
+        token, generation = self._document()
+        key = (token, kind) + tuple(locator)
+        self._entries[key] = (generation, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def revalidate(self) -> None:
+        """
+        Force the next lookup to re-read the document state, e.g. after an
+        action that may have changed the page or a frame or window switch
+        made directly on the driver
+        :return: None
+        """
+        self._validated_at = None
+
+    def invalidate(self, locator: Optional[tuple] = None) -> None:
+        """
+        Drop cached results
+        :param locator: only drop results of this locator
+        :return: None
+        """
+        if locator is None:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+        else:
+            locator = tuple(locator)
+            for key in [key for key in self._entries if key[2:] == locator]:
+                del self._entries[key]
+                self.invalidations += 1
+        self.revalidate()
+
+    def stats(self) -> dict:
+        """
+        Hit/miss counters
+        :return: dict
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "size": len(self._entries),
+        }
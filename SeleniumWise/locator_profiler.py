@@ -0,0 +1,316 @@
+"""
+The Module profiles locators against the live page and suggests faster ones.
+"""
+import importlib
+import inspect
+import re
+import statistics
+import time
+from typing import Iterable, List, Optional, Union
+
+from selenium.common.exceptions import InvalidSelectorException, NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from SeleniumWise.element_interactions import ElementOperations
+from SeleniumWise.scripts import ELEMENT_IDENTITY_SCRIPT
+
+_STRATEGIES = {
+    value
+    for name, value in vars(By).items()
+    if not name.startswith("_") and isinstance(value, str)
+}
+
+# One location step of an abbreviated XPath: separator, node test, predicates.
+_STEP = re.compile(r"(//|/)(\*|[A-Za-z][\w-]*)((?:\[[^\[\]]*\])*)")
+_PREDICATE = re.compile(r"\[([^\[\]]*)\]")
+_QUOTED = r"""(?:'([^']*)'|"([^"]*)")"""
+_ATTRIBUTE_EQUALS = re.compile(rf"^\s*@([\w-]+)\s*=\s*{_QUOTED}\s*$")
+_ATTRIBUTE_FUNCTION = re.compile(
+    rf"^\s*(contains|starts-with)\(\s*@([\w-]+)\s*,\s*{_QUOTED}\s*\)\s*$"
+)
+_ATTRIBUTE_EXISTS = re.compile(r"^\s*@([\w-]+)\s*$")
+_POSITION = re.compile(r"^\s*(\d+)\s*$")
+_IDENTIFIER = re.compile(r"^-?[A-Za-z_][\w-]*$")
+
+
+def _css_string(value: str) -> str:
+    """
+    Quote a value for a CSS attribute selector
+    :param value: raw value
+    :return: quoted value
+    """
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _css_predicate(predicate: str, tag: str) -> Optional[str]:
+    """
+    Translate one XPath predicate into a CSS fragment
+    :param predicate: predicate body without brackets
+    :param tag: node test of the step
+    :return: CSS fragment, or None when CSS cannot express it
+    """
+    match = _ATTRIBUTE_EQUALS.match(predicate)
+    if match:
+        name, value = match.group(1), match.group(2) or match.group(3) or ""
+        if name == "id" and _IDENTIFIER.match(value):
+            return "#" + value
+        return f"[{name}={_css_string(value)}]"
+    match = _ATTRIBUTE_FUNCTION.match(predicate)
+    if match:
+        operator = "*=" if match.group(1) == "contains" else "^="
+        value = match.group(3) or match.group(4) or ""
+        return f"[{match.group(2)}{operator}{_css_string(value)}]"
+    match = _ATTRIBUTE_EXISTS.match(predicate)
+    if match:
+        return f"[{match.group(1)}]"
+    match = _POSITION.match(predicate)
+    if match and tag != "*":
+        return f":nth-of-type({match.group(1)})"
+    return None
+
+
+def xpath_to_css(xpath: str) -> Optional[str]:
+    """
+    Rewrite a simple abbreviated XPath (child and descendant steps with
+    attribute, contains/starts-with and position predicates) as CSS
+    :param xpath: XPath expression
+    :Example: xpath_to_css("//div[@id='main']//a[@href]") == "div#main a[href]"
+    :return: CSS selector, or None when the XPath uses anything else
+    """
+    xpath = xpath.strip()
+    position = 0
+    parts = []
+    while position < len(xpath):
+        match = _STEP.match(xpath, position)
+        if not match:
+            return None
+        separator, tag, predicates = match.groups()
+        selector = "" if tag == "*" else tag
+        for predicate in _PREDICATE.findall(predicates):
+            fragment = _css_predicate(predicate, tag)
+            if fragment is None:
+                return None
+            selector += fragment
+        if parts:
+            parts.append(" > " if separator == "/" else " ")
+        parts.append(selector or "*")
+        position = match.end()
+    return "".join(parts) or None
+
+
+def xpath_to_id(xpath: str) -> Optional[str]:
+    """
+    Recognise an XPath that only selects by id, like //*[@id='x']
+    :param xpath: XPath expression
+    :return: the id, or None
+    """
+    match = re.match(
+        rf"^\s*//(?:\*|[A-Za-z][\w-]*)\[\s*@id\s*=\s*{_QUOTED}\s*\]\s*$", xpath
+    )
+    if match:
+        return match.group(1) or match.group(2)
+    return None
+
+
+class LocatorProfiler:
+    """
+    Times a locator and equivalent alternatives with the ElementOperations
+    lookup against the current page: id and CSS rewrites of simple XPaths,
+    the element's own id or name, and CSS scoped to the nearest ancestor
+    with an id. Only alternatives resolving to the same element are
+    considered. The locator cache is disabled while timing, and lookups
+    bypass the error policy so that misses are neither logged nor recorded
+    as session failures.
+    """
+
+    def __init__(
+        self,
+        driver,
+        repeat: int = 5,
+        element_operations: Optional[ElementOperations] = None,
+    ):
+        self.driver = driver
+        self.repeat = repeat
+        self.operations = element_operations or ElementOperations(driver)
+
+    def alternatives(self, locator: tuple, element=None) -> List[tuple]:
+        """
+        Candidate locators equivalent to the given one
+        :param locator: (By, value)
+        :param element: the element the locator resolves to, enables the
+            id/name and scoped CSS candidates
+        :return: list of (By, value), without the original
+        """
+        by, value = locator
+        candidates = []
+        css = value if by == By.CSS_SELECTOR else None
+        if by == By.XPATH:
+            element_id = xpath_to_id(value)
+            if element_id:
+                candidates.append((By.ID, element_id))
+            css = xpath_to_css(value)
+            if css:
+                candidates.append((By.CSS_SELECTOR, css))
+        if element is not None:
+            identity = self.driver.execute_script(ELEMENT_IDENTITY_SCRIPT, element)
+            if identity["id"]:
+                candidates.append((By.ID, identity["id"]))
+            if identity["name"]:
+                candidates.append((By.NAME, identity["name"]))
+            ancestor = identity["ancestor"]
+            if ancestor and _IDENTIFIER.match(ancestor):
+                scope = "#" + ancestor
+                if css and "," not in css and not css.startswith("#"):
+                    candidates.append((By.CSS_SELECTOR, f"{scope} {css}"))
+                classes = "".join(
+                    "." + name
+                    for name in identity["classes"]
+                    if _IDENTIFIER.match(name)
+                )
+                candidates.append(
+                    (By.CSS_SELECTOR, f"{scope} {identity['tag']}{classes}")
+                )
+        unique = []
+        for candidate in candidates:
+            if candidate != tuple(locator) and candidate not in unique:
+                unique.append(candidate)
+        return unique
+
+    def _time(self, locator: tuple):
+        """
+        Resolve a locator repeat times
+        :param locator: (By, value)
+        :return: (median milliseconds, element or None)
+        """
+        durations = []
+        element = None
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            try:
+                element = self.operations._find("element", locator)
+            except (NoSuchElementException, InvalidSelectorException):
+                element = None
+            durations.append((time.perf_counter() - started) * 1000)
+        return statistics.median(durations), element
+
+    def profile(self, locator: tuple) -> dict:
+        """
+        Time a locator and its alternatives
+        :param locator: (By, value)
+        :Example: profile((By.XPATH, "//div//span[contains(@class, 'price')]"))
+        :return: {"locator", "found", "median_ms", "candidates", "fastest",
+            "speedup"}; candidates hold locator, median_ms and same_element
+        """
+        locator = tuple(locator)
+        cache = self.operations.locator_cache
+        self.operations.locator_cache = None
+        try:
+            median, element = self._time(locator)
+            report = {
+                "locator": locator,
+                "found": element is not None,
+                "median_ms": median,
+                "candidates": [],
+                "fastest": locator,
+                "speedup": 1.0,
+            }
+            if element is None:
+                return report
+            fastest = median
+            for candidate in self.alternatives(locator, element):
+                candidate_median, found = self._time(candidate)
+                same = found is not None and found == element
+                report["candidates"].append(
+                    {
+                        "locator": candidate,
+                        "median_ms": candidate_median,
+                        "same_element": same,
+                    }
+                )
+                if same and candidate_median < fastest:
+                    fastest = candidate_median
+                    report["fastest"] = candidate
+            report["speedup"] = median / fastest if fastest else 1.0
+            return report
+        finally:
+            self.operations.locator_cache = cache
+
+    def profile_module(self, module) -> List[dict]:
+        """
+        Profile every locator tuple defined in a page-object module, at
+        module level or as class attributes; each report gets a "name"
+        :param module: module object or dotted module name
+        :return: list of reports, largest speedup first
+        """
+        if isinstance(module, str):
+            module = importlib.import_module(module)
+        reports = []
+        for name, locator in find_locators(module):
+            report = self.profile(locator)
+            report["name"] = name
+            reports.append(report)
+        reports.sort(key=lambda report: report["speedup"], reverse=True)
+        return reports
+
+
+def find_locators(module) -> List[tuple]:
+    """
+    Collect the (By, value) tuples of a page-object module
+    :param module: module object
+    :return: [(qualified name, locator), ...]
+    """
+    found = []
+
+    def scan(prefix: str, namespace: dict) -> None:
+        for name, value in namespace.items():
+            if name.startswith("__"):
+                continue
+            if is_locator(value):
+                found.append((prefix + name, value))
+            elif inspect.isclass(value) and value.__module__ == module.__name__:
+                scan(f"{prefix}{name}.", vars(value))
+
+    scan("", vars(module))
+    return found
+
+
+def is_locator(value) -> bool:
+    """
+    Whether a value looks like a (By, value) tuple
+    :param value: any value
+    :return: bool
+    """
+    return (
+        isinstance(value, tuple)
+        and len(value) == 2
+        and value[0] in _STRATEGIES
+        and isinstance(value[1], str)
+    )
+
+
+def format_report(reports: Union[dict, Iterable[dict]]) -> str:
+    """
+    Render profile reports as plain text
+    :param reports: report or list of reports
+    :return: str
+    """
+    if isinstance(reports, dict):
+        reports = [reports]
+    lines = []
+    for report in reports:
+        title = report.get("name") or "{0}={1}".format(*report["locator"])
+        if not report["found"]:
+            lines.append(f"{title}: not found")
+            continue
+        lines.append(
+            f"{title}: {report['median_ms']:.2f} ms, "
+            f"fastest {report['fastest'][0]}={report['fastest'][1]} "
+            f"({report['speedup']:.1f}x)"
+        )
+        for candidate in report["candidates"]:
+            mark = "" if candidate["same_element"] else " (different element)"
+            lines.append(
+                f"    {candidate['locator'][0]}={candidate['locator'][1]}: "
+                f"{candidate['median_ms']:.2f} ms{mark}"
+            )
+    return "\n".join(lines)
@@ -3,17 +3,73 @@ Module inherits the SeleniumWise class and adds navigation methods.
 """
 
 import logging
+from concurrent.futures import Future
+from typing import Iterable, Optional, Sequence
 
 from selenium.webdriver.remote.webelement import WebElement
 
+from SeleniumWise.errors import ErrorPolicy, NavigationError, guarded
+from SeleniumWise.frame_context import FrameContext, frame_context
+from SeleniumWise.navigation_timing import (
+    NavigationTiming,
+    NavigationTimingAggregator,
+    timed_get,
+)
+from SeleniumWise.page_source_store import PageSourceStore
+from SeleniumWise.screenshots import ScreenshotPipeline
+from SeleniumWise.scripts import SCROLL_SCRIPT, SCROLL_SNAPSHOT_SCRIPT, fields_script
+from SeleniumWise.session_state import (
+    apply_session,
+    capture_session,
+    read_state,
+    session_problems,
+    write_state,
+)
+
+SCROLL_MODES = ("always", "if_needed")
+
 
 class Navigation:
     """
     The following methods are not part of the SeleniumWise class
+
+    ``error_policy`` decides what the scroll methods do on failure: log and
+    return None (the default), raise a NavigationError, or retry first.
+
+    ``scroll_mode="always"`` scrolls every element with scrollIntoView()
+    before acting on it. ``scroll_mode="if_needed"`` checks in the same
+    script call whether the element is fully visible in the viewport and
+    its scrolling ancestors, and only scrolls when it is not, aligned with
+    ``scroll_block``/``scroll_inline`` ("start", "center", "end" or
+    "nearest") and without smooth scrolling.
     """
 
-    def __init__(self, driver):
+    def __init__(
+        self,
+        driver,
+        error_policy: Optional[ErrorPolicy] = None,
+        scroll_mode: str = "always",
+        scroll_block: str = "center",
+        scroll_inline: str = "nearest",
+    ):
+        if scroll_mode not in SCROLL_MODES:
+            raise ValueError(f"Unknown scroll mode: {scroll_mode}")
         self.driver = driver
+        self.error_policy = error_policy or ErrorPolicy()
+        self.scroll_mode = scroll_mode
+        self.scroll_block = scroll_block
+        self.scroll_inline = scroll_inline
+        self.screenshot_pipeline = None
+        self.page_source_store = None
+        self.timing_aggregator = None
+
+    @property
+    def frames(self) -> FrameContext:
+        """
+        Frame tracking shared with the other SeleniumWise objects of the driver
+        :return: FrameContext
+        """
+        return frame_context(self.driver)
 
     def back(self):
         """
@@ -21,6 +77,7 @@ class Navigation:
         :return:
         """
         self.driver.back()
+        self.frames.reset()
 
     def forward(self):
         """
@@ -28,6 +85,7 @@ class Navigation:
         :return:
         """
         self.driver.forward()
+        self.frames.reset()
 
     def refresh(self):
         """
@@ -35,14 +93,55 @@ class Navigation:
         :return:
         """
         self.driver.refresh()
+        self.frames.reset()
 
-    def navigate(self, url):
+    def navigate(
+        self, url, timing: Optional[bool] = None, max_wait: float = 10
+    ) -> Optional[NavigationTiming]:
         """
         Navigate to the specified URL
+        With timing, one async script after the load reads the navigation
+        timing, first (contentful) paint, largest contentful paint and the
+        resource counts; the result also goes to the timing aggregator
         :param url:
-        :return:
-        """
-        self.driver.get(url)
+        :param timing: collect timings, by default only while
+            enable_navigation_timing() is active
+        :param max_wait: seconds to wait for the load event when it has not
+            fired, keep it below the driver's script timeout
+        :return: NavigationTiming when timing, else None
+        """
+        if timing is None:
+            timing = self.timing_aggregator is not None
+        if not timing:
+            self.driver.get(url)
+            self.frames.reset()
+            return None
+        result = timed_get(self.driver, url, max_wait)
+        self.frames.reset()
+        if self.timing_aggregator is not None:
+            self.timing_aggregator.add(result)
+        return result
+
+    def enable_navigation_timing(
+        self, patterns: Optional[Iterable] = None
+    ) -> NavigationTimingAggregator:
+        """
+        Time every navigate() call and aggregate the results
+        :param patterns: fnmatch globs or compiled regexes grouping URLs,
+            e.g. "https://shop/*/cart"; URLs matching none are grouped
+            without their query and fragment
+        :return: NavigationTimingAggregator, see report()
+        """
+        self.timing_aggregator = NavigationTimingAggregator(patterns)
+        return self.timing_aggregator
+
+    def disable_navigation_timing(self) -> Optional[NavigationTimingAggregator]:
+        """
+        Stop timing navigate() calls
+        :return: the aggregator that was active, for a last report
+        """
+        aggregator, self.timing_aggregator = self.timing_aggregator, None
+        return aggregator
 
     def close(self):
         """
@@ -50,6 +149,7 @@ class Navigation:
         :return:
         """
         self.driver.close()
+        self.frames.reset()
 
     def quit(self):
         """
@@ -100,6 +200,34 @@ class Navigation:
         """
         return self.driver.page_source
 
+    def enable_page_source_store(
+        self, path: Optional[str] = None, **kwargs
+    ) -> PageSourceStore:
+        """
+        Archive page sources taken with snapshot_page_source as compressed
+        deltas streamed to disk
+        :param path: store file, a temporary file when omitted
+        :param kwargs: keyframe_interval, cache_bytes and level, see
+            PageSourceStore
+        :return: PageSourceStore, see PageSourceStore.get()
+        """
+        if self.page_source_store is not None:
+            self.page_source_store.close()
+        self.page_source_store = PageSourceStore(path, **kwargs)
+        return self.page_source_store
+
+    def snapshot_page_source(self) -> int:
+        """
+        Store the current page source; starts a default store if none is
+        enabled
+        :return: snapshot id
+        """
+        if self.page_source_store is None:
+            self.enable_page_source_store()
+        return self.page_source_store.add(
+            self.driver.page_source, self.driver.current_url
+        )
+
     def get_window_size(self):
         """
         Get the current window size
@@ -166,6 +294,43 @@ class Navigation:
         """
         return self.driver.get_screenshot_as_png()
 
+    def enable_screenshot_pipeline(
+        self, workers: int = 2, max_queue: int = 32
+    ) -> ScreenshotPipeline:
+        """
+        Write screenshots taken with capture_screenshot on background threads
+        :param workers: number of writer threads
+        :param max_queue: captures that may wait before capture blocks
+        :return: ScreenshotPipeline, see ScreenshotPipeline.stats()
+        """
+        self.disable_screenshot_pipeline()
+        self.screenshot_pipeline = ScreenshotPipeline(self.driver, workers, max_queue)
+        return self.screenshot_pipeline
+
+    def disable_screenshot_pipeline(self):
+        """
+        Write the pending screenshots and stop the pipeline
+        :return:
+        """
+        if self.screenshot_pipeline is not None:
+            self.screenshot_pipeline.close()
+            self.screenshot_pipeline = None
+
+    def capture_screenshot(
+        self, filename, element: Optional[WebElement] = None
+    ) -> Future:
+        """
+        Take a screenshot and write it in the background, skipping it when
+        it is identical to the previous one; starts a default pipeline if
+        none is enabled
+        :param filename:
+        :param element: only capture this element, cropped by the browser
+        :return: Future resolving to the path of the written file
+        """
+        if self.screenshot_pipeline is None:
+            self.enable_screenshot_pipeline()
+        return self.screenshot_pipeline.capture(filename, element)
+
     def get_cookies(self):
         """
         Get all cookies
@@ -204,20 +369,78 @@ class Navigation:
         """
         self.driver.delete_all_cookies()
 
+    def save_session(
+        self,
+        path,
+        domains: Optional[Iterable[str]] = None,
+        origins: Iterable[str] = (),
+    ):
+        """
+        Save the cookies and the localStorage and sessionStorage of the
+        current origin and of ``origins`` to a file, all cookies in one CDP
+        command where available. Each other origin is visited to read its
+        storage, then the current URL is opened again
+        :param path:
+        :param domains: only keep cookies of these domains and subdomains
+        :param origins: other origins whose web storage the login needs
+        :return:
+        """
+        state = capture_session(self.driver, domains, origins)
+        if origins:
+            self.frames.reset()
+        write_state(path, state)
+
+    def restore_session(
+        self,
+        path,
+        max_age: Optional[float] = None,
+        required_cookies: Iterable[str] = (),
+    ) -> bool:
+        """
+        Restore a state saved with save_session: unexpired cookies in one
+        batched CDP command where available, web storage in one script per
+        origin. Nothing is restored when the file is missing, older than
+        max_age, or lacks an unexpired required cookie
+        :param path:
+        :param max_age: maximum age of the saved state in seconds
+        :param required_cookies: names of the cookies the login depends on
+        :return: True when restored, False when the caller has to log in
+        """
+        state = read_state(path)
+        if state is None:
+            return False
+        problems = session_problems(state, max_age, required_cookies)
+        if problems:
+            logging.info(f"Session state {path} not restored: {', '.join(problems)}")
+            return False
+        apply_session(self.driver, state)
+        self.frames.reset()
+        return True
+
     def switch_to_frame(self, frame_reference):
         """
         Switch to the specified frame
-        :param frame_reference:
+        :param frame_reference: index, id or name, locator or WebElement
         :return:
         """
-        self.driver.switch_to.frame(frame_reference)
+        self.frames.switch_to_frame(frame_reference)
+
+    def switch_to_frame_path(self, *frame_references):
+        """
+        Switch to a nested frame by its path from the top-level document,
+        skipping the switches that are not needed from the current frame
+        :param frame_references: frame references, outermost first
+        :return:
+        """
+        self.frames.switch_to_path(frame_references)
 
     def switch_to_default_content(self):
         """
-        Switch to the default content
+        Switch to the default content, always sending the command since the
+        driver may have been switched by code the frame tracking does not see
         :return:
         """
-        self.driver.switch_to.default_content()
+        self.frames.switch_to_default_content(force=True)
 
     def switch_to_window(self, window_name):
         """
@@ -226,6 +449,7 @@ class Navigation:
         :return:
         """
         self.driver.switch_to.window(window_name)
+        self.frames.reset()
 
     def switch_to_alert(self):
         """
@@ -246,31 +470,87 @@ class Navigation:
         Switch to the parent frame
         :return:
         """
-        return self.driver.switch_to.parent_frame
+        self.frames.switch_to_parent_frame()
+
+    def _scroll_options(self) -> Optional[dict]:
+        """
+        scrollToElement options of the scroll mode
+        :return: None for "always", the alignment for "if_needed"
+        """
+        if self.scroll_mode == "always":
+            return None
+        return {"block": self.scroll_block, "inline": self.scroll_inline}
+
+    def _scroll(self, element: WebElement) -> bool:
+        """
+        Scroll to the element according to the scroll mode
+        :param element: WebElement
+        :return: whether the page scrolled
+        """
+        return self.driver.execute_script(
+            SCROLL_SCRIPT, element, self._scroll_options()
+        )
 
+    def _scroll_and_read(self, element: WebElement, field: str):
+        """
+        Scroll to the element and read one field with a single script call
+        :param element: WebElement
+        :param field: readFields field name
+        :return: the field's value
+        """
+        record = self.driver.execute_script(
+            fields_script(SCROLL_SNAPSHOT_SCRIPT, [field]),
+            element,
+            [field],
+            self._scroll_options(),
+        )
+        return record[field]
+
+    @guarded(NavigationError)
+    def scroll_to_element_and_snapshot(
+        self, element: WebElement, fields: Sequence[str] = ("rect", "text")
+    ) -> dict:
+        """
+        Scroll to the specified element and read many fields in the same
+        script call. Fields: text, tag_name, rect, location, size,
+        displayed, enabled, selected, attribute:<name>, dom_attribute:<name>,
+        property:<name> and css:<name>; attribute and displayed run
+        Selenium's own atoms, text is empty when the element is not rendered
+        and css values are the computed style with colors as rgba(), as with
+        the WebElement calls
+        :param element:
+        :param fields: fields to read
+        :Example: scroll_to_element_and_snapshot(element, ["text", "css:color"])
+        :return: {field: value}
+        """
+        fields = list(fields)
+        return self.driver.execute_script(
+            fields_script(SCROLL_SNAPSHOT_SCRIPT, fields),
+            element,
+            fields,
+            self._scroll_options(),
+        )
+
+    @guarded(NavigationError)
     def scroll_to_element(self, element: WebElement):
         """
         Scroll to the specified element
         :param element:
         :return:
         """
-        try:
-            self.driver.execute_script("arguments[0].scrollIntoView();", element)
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        self._scroll(element)
 
+    @guarded(NavigationError)
     def scroll_to_element_and_click(self, element: WebElement):
         """
         Scroll to the specified element and click
         :param element:
         :return:
         """
-        try:
-            self.driver.execute_script("arguments[0].scrollIntoView();", element)
-            element.click()
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        self._scroll(element)
+        element.click()
 
+    @guarded(NavigationError)
     def scroll_to_element_and_send_keys(self, element: WebElement, keys):
         """
         Scroll to the specified element and send keys
@@ -278,24 +558,20 @@ class Navigation:
         :param keys:
         :return:
         """
-        try:
-            self.driver.execute_script("arguments[0].scrollIntoView();", element)
-            element.send_keys(keys)
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        self._scroll(element)
+        element.send_keys(keys)
 
+    @guarded(NavigationError)
     def scroll_to_element_and_clear(self, element: WebElement):
         """
         Scroll to the specified element and clear
         :param element:
         :return:
         """
-        try:
-            self.driver.execute_script("arguments[0].scrollIntoView();", element)
-            element.clear()
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        self._scroll(element)
+        element.clear()
 
+    @guarded(NavigationError)
     def scroll_to_element_and_get_attribute(
         self, element: WebElement, attribute: str
     ) -> str:
@@ -305,12 +581,9 @@ class Navigation:
         :param attribute:
         :return:
         """
-        try:
-            self.driver.execute_script("arguments[0].scrollIntoView();", element)
-            return element.get_attribute(attribute)
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._scroll_and_read(element, f"attribute:{attribute}")
 
+    @guarded(NavigationError)
     def scroll_to_element_and_get_property(
         self, element: WebElement, property: str
     ) -> str:
@@ -320,12 +593,9 @@ class Navigation:
         :param property:
         :return:
         """
-        try:
-            self.driver.execute_script("arguments[0].scrollIntoView();", element)
-            return element.get_property(property)
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._scroll_and_read(element, f"property:{property}")
 
+    @guarded(NavigationError)
     def scroll_to_element_and_get_css_value(
         self, element: WebElement, css_property: str
     ) -> str:
@@ -335,149 +605,113 @@ class Navigation:
         :param css_property:
         :return:
         """
-        try:
-            self.driver.execute_script("arguments[0].scrollIntoView();", element)
-            return element.value_of_css_property(css_property)
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._scroll_and_read(element, f"css:{css_property}")
 
+    @guarded(NavigationError)
     def scroll_to_element_and_get_text(self, element: WebElement) -> str:
         """
         Scroll to the specified element and get text
         :param element:
         :return:
         """
-        try:
-            self.driver.execute_script("arguments[0].scrollIntoView();", element)
-            return element.text
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._scroll_and_read(element, "text")
 
+    @guarded(NavigationError)
     def scroll_horizontally(self, x):
         """
         Scroll horizontally
         :param x:
         :return:
         """
-        try:
-            self.driver.execute_script(f"window.scrollTo({x}, 0)")
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        self.driver.execute_script(f"window.scrollTo({x}, 0)")
 
+    @guarded(NavigationError)
     def scroll_vertically(self, y):
         """
         Scroll vertically
         :param y:
         :return:
         """
-        try:
-            self.driver.execute_script(f"window.scrollTo(0, {y})")
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        self.driver.execute_script(f"window.scrollTo(0, {y})")
 
+    @guarded(NavigationError)
     def scroll_to_element_and_get_location(self, element: WebElement) -> dict:
         """
         Scroll to the specified element and get location
         :param element:
         :return:
         """
-        try:
-            self.driver.execute_script("arguments[0].scrollIntoView();", element)
-            return element.location
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._scroll_and_read(element, "location")
 
+    @guarded(NavigationError)
     def scroll_to_element_and_get_size(self, element: WebElement) -> dict:
         """
         Scroll to the specified element and get size
         :param element:
         :return:
         """
-        try:
-            self.driver.execute_script("arguments[0].scrollIntoView();", element)
-            return element.size
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._scroll_and_read(element, "size")
 
+    @guarded(NavigationError)
     def scroll_to_element_and_get_tag_name(self, element: WebElement) -> str:
         """
         Scroll to the specified element and get tag name
         :param element:
         :return:
         """
-        try:
-            self.driver.execute_script("arguments[0].scrollIntoView();", element)
-            return element.tag_name
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._scroll_and_read(element, "tag_name")
 
+    @guarded(NavigationError)
     def scroll_to_element_and_get_rect(self, element: WebElement) -> dict:
         """
         Scroll to the specified element and get rect
         :param element:
         :return:
         """
-        try:
-            self.driver.execute_script("arguments[0].scrollIntoView();", element)
-            return element.rect
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._scroll_and_read(element, "rect")
 
+    @guarded(NavigationError)
     def scroll_to_element_and_get_is_displayed(self, element: WebElement) -> bool:
         """
         Scroll to the specified element and get is displayed
         :param element:
         :return:
         """
-        try:
-            self.driver.execute_script("arguments[0].scrollIntoView();", element)
-            return element.is_displayed()
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._scroll_and_read(element, "displayed")
 
+    @guarded(NavigationError)
     def scroll_to_element_and_get_is_enabled(self, element: WebElement) -> bool:
         """
         Scroll to the specified element and get is enabled
         :param element:
         :return:
         """
-        try:
-            self.driver.execute_script("arguments[0].scrollIntoView();", element)
-            return element.is_enabled()
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._scroll_and_read(element, "enabled")
 
+    @guarded(NavigationError)
     def scroll_to_element_and_get_is_selected(self, element: WebElement) -> bool:
         """
         Scroll to the specified element and get is selected
         :param element:
         :return:
         """
-        try:
-            self.driver.execute_script("arguments[0].scrollIntoView();", element)
-            return element.is_selected()
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._scroll_and_read(element, "selected")
 
+    @guarded(NavigationError)
     def scroll_into_view(self, element: WebElement):
         """
         Scroll to the specified element
         :param element:
         :return:
         """
-        try:
-            self.driver.execute_script("arguments[0].scrollIntoView();", element)
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        self._scroll(element)
 
+    @guarded(NavigationError)
     def scroll_into_view_and_click(self, element: WebElement):
         """
         Scroll to the specified element and click
         :param element:
         :return:
         """
-        try:
-            self.driver.execute_script("arguments[0].scrollIntoView();", element)
-            element.click()
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        self._scroll(element)
+        element.click()
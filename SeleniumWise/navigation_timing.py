@@ -0,0 +1,242 @@
+"""
+The Module collects page-load timings and aggregates them across a run.
+"""
+import json
+import re
+import threading
+import time
+from fnmatch import fnmatchcase
+from typing import Iterable, Optional, Sequence, Union
+from urllib.parse import urlsplit
+
+from SeleniumWise.scripts import NAVIGATION_TIMING_SCRIPT
+
+# Metrics reported by NavigationTimingAggregator.report() by default.
+DEFAULT_METRICS = ("ttfb", "dom_content_loaded", "load", "fcp", "lcp", "wall")
+
+
+class NavigationTiming:
+    """
+    Timings of one page load in milliseconds since navigation start; None
+    where the browser does not report a metric.
+    """
+
+    __slots__ = (
+        "url",
+        "requested_url",
+        "wall",
+        "type",
+        "redirect_count",
+        "dns",
+        "connect",
+        "ttfb",
+        "response_end",
+        "dom_interactive",
+        "dom_content_loaded",
+        "load",
+        "transfer_size",
+        "encoded_body_size",
+        "decoded_body_size",
+        "first_paint",
+        "fcp",
+        "lcp",
+        "resource_count",
+        "resource_transfer_size",
+        "resources_by_type",
+    )
+
+    def __init__(self, requested_url: str, wall: float, data: dict):
+        self.requested_url = requested_url
+        self.wall = wall
+        self.url = data.get("url") or requested_url
+        navigation = data.get("navigation") or {}
+        for name in (
+            "type",
+            "redirect_count",
+            "dns",
+            "connect",
+            "ttfb",
+            "response_end",
+            "dom_interactive",
+            "dom_content_loaded",
+            "load",
+            "transfer_size",
+            "encoded_body_size",
+            "decoded_body_size",
+        ):
+            setattr(self, name, navigation.get(name))
+        self.first_paint = data.get("first_paint")
+        self.fcp = data.get("first_contentful_paint")
+        self.lcp = data.get("largest_contentful_paint")
+        self.resource_count = data.get("resource_count", 0)
+        self.resource_transfer_size = data.get("resource_transfer_size", 0)
+        self.resources_by_type = data.get("resources_by_type") or {}
+
+    def __repr__(self):
+        return (
+            f"NavigationTiming({self.url!r}, ttfb={self.ttfb}, load={self.load}, "
+            f"fcp={self.fcp}, lcp={self.lcp})"
+        )
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def collect_navigation_timing(
+    driver, requested_url: Optional[str] = None, wall: float = 0.0, max_wait: float = 10
+) -> NavigationTiming:
+    """
+    Read the timings of the current document with one async script
+    :param driver: WebDriver
+    :param requested_url: URL passed to driver.get, defaults to the page URL
+    :param wall: milliseconds driver.get took, as seen by the client
+    :param max_wait: seconds to wait for the load event when it has not
+        fired, keep it below the driver's script timeout
+    :return: NavigationTiming
+    """
+    data = driver.execute_async_script(NAVIGATION_TIMING_SCRIPT, int(max_wait * 1000))
+    data = data or {}
+    return NavigationTiming(requested_url or data.get("url"), wall, data)
+
+
+def timed_get(driver, url: str, max_wait: float = 10) -> NavigationTiming:
+    """
+    Navigate and collect the timings of the page load
+    :param driver: WebDriver
+    :param url: URL to open
+    :param max_wait: seconds to wait for the load event when it has not
+        fired, keep it below the driver's script timeout
+    :return: NavigationTiming
+    """
+    started = time.perf_counter()
+    driver.get(url)
+    wall = (time.perf_counter() - started) * 1000
+    return collect_navigation_timing(driver, url, wall, max_wait)
+
+
+def _percentile(values: list, percent: float) -> float:
+    """
+    Linearly interpolated percentile of sorted values
+    :param values: sorted numbers
+    :param percent: 0 to 100
+    :return: float
+    """
+    if len(values) == 1:
+        return values[0]
+    rank = (len(values) - 1) * percent / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (rank - lower)
+
+
+def _compile(pattern: Union[str, re.Pattern]):
+    """
+    Matcher for an fnmatch glob or a compiled regex
+    :param pattern: pattern
+    :return: callable taking the full URL and the URL without query and
+        fragment; regexes search the former, globs match the latter
+    """
+    if isinstance(pattern, re.Pattern):
+        return lambda url, path: bool(pattern.search(url))
+    return lambda url, path: fnmatchcase(path, pattern)
+
+
+class NavigationTimingAggregator:
+    """
+    Collects NavigationTiming results of a run and reports percentiles per
+    URL pattern. A timing counts under the first of ``patterns`` its URL
+    matches, otherwise under its URL without query and fragment. Globs are
+    matched against the URL without query and fragment, compiled regexes are
+    searched in the full URL.
+    """
+
+    def __init__(self, patterns: Optional[Iterable[Union[str, re.Pattern]]] = None):
+        self.patterns = [(pattern, _compile(pattern)) for pattern in patterns or ()]
+        self._lock = threading.Lock()
+        self._timings = {}
+
+    def key(self, url: str) -> str:
+        """
+        Group a URL falls into
+        :param url: page URL
+        :return: the matching pattern, or the URL without query and fragment
+        """
+        parts = urlsplit(url)
+        path = f"{parts.scheme}://{parts.netloc}{parts.path}"
+        for pattern, matches in self.patterns:
+            if matches(url, path):
+                return getattr(pattern, "pattern", pattern)
+        return path
+
+    def add(self, timing: NavigationTiming) -> None:
+        """
+        Record one page load
+        :param timing: NavigationTiming
+        :return: None
+        """
+        with self._lock:
+            self._timings.setdefault(self.key(timing.requested_url or ""), []).append(
+                timing
+            )
+
+    def timings(self, key: Optional[str] = None) -> list:
+        """
+        Recorded page loads
+        :param key: only loads of this group
+        :return: list of NavigationTiming
+        """
+        with self._lock:
+            if key is not None:
+                return list(self._timings.get(key, ()))
+            return [timing for group in self._timings.values() for timing in group]
+
+    def report(
+        self,
+        metrics: Sequence[str] = DEFAULT_METRICS,
+        percentiles: Sequence[float] = (50, 90, 95),
+    ) -> dict:
+        """
+        Percentiles of each metric per group
+        :param metrics: NavigationTiming attributes to report
+        :param percentiles: percentiles to compute
+        :Example: report()["https://shop/*/cart"]["load"]["p95"]
+        :return: {group: {"count": n, metric: {"count", "min", "max",
+            "p50", ...}}}
+        """
+        with self._lock:
+            groups = {key: list(group) for key, group in self._timings.items()}
+        result = {}
+        for key, group in groups.items():
+            row = {"count": len(group)}
+            for metric in metrics:
+                values = sorted(
+                    value
+                    for value in (getattr(timing, metric) for timing in group)
+                    if value is not None
+                )
+                if not values:
+                    continue
+                stats = {"count": len(values), "min": values[0], "max": values[-1]}
+                for percent in percentiles:
+                    stats[f"p{percent:g}"] = _percentile(values, percent)
+                row[metric] = stats
+            result[key] = row
+        return result
+
+    def dump_json(self, path: str, **kwargs) -> None:
+        """
+        Write the report as JSON
+        :param path: file path
+        :param kwargs: report() arguments
+        :return: None
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.report(**kwargs), file, indent=2)
+
+    def clear(self) -> None:
+        """
+        Forget every recorded page load
+        :return: None
+        """
+        with self._lock:
+            self._timings.clear()
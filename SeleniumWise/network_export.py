@@ -0,0 +1,534 @@
+"""
+The Module is used to stream captured network traffic to HAR or JSON-lines
+files and to read those files back.
+"""
+import gzip
+import json
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+HAR_CREATOR = {"name": "SeleniumWise", "version": "0.0.1"}
+
+
+def _open(path: str, mode: str, compress: Optional[bool]):
+    """
+    Open a text file, gzip compressed when asked or when the path ends in .gz
+    :param path: file path
+    :param mode: "r" or "w"
+    :param compress: force compression on or off, None to infer from path
+    :return: file object
+    """
+    if compress is None:
+        compress = path.endswith(".gz")
+    if compress:
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _format_of(path: str) -> str:
+    """
+    Infer the export format from a file name
+    :param path: file path
+    :return: "har" or "ndjson"
+    """
+    name = path[:-3] if path.endswith(".gz") else path
+    return "har" if name.endswith(".har") else "ndjson"
+
+
+class _StreamWriter:
+    """
+    Shared buffering and flushing logic of the traffic writers.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        compress: Optional[bool] = None,
+        flush_every: int = 100,
+        flush_interval: float = 5.0,
+    ):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._file = _open(path, "w", compress)
+        self._unflushed = 0
+        self._flushed_at = time.monotonic()
+        self.on_close = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def write_event(self, message: dict, timestamp: float) -> None:
+        """
+        Consume one CDP network event
+        :param message: CDP event with method and params
+        :param timestamp: log time in milliseconds since the epoch
+        :return: None
+        """
+        raise NotImplementedError
+
+    def _written(self) -> None:
+        """
+        Count a written record and flush when a threshold is reached
+        :return: None
+        """
+        self._unflushed += 1
+        if (
+            self._unflushed >= self.flush_every
+            or time.monotonic() - self._flushed_at >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Flush buffered records to disk
+        :return: None
+        """
+        self._file.flush()
+        self._unflushed = 0
+        self._flushed_at = time.monotonic()
+
+    def close(self) -> None:
+        """
+        Flush and close the file
+        :return: None
+        """
+        if self._file.closed:
+            return
+        if self.on_close is not None:
+            self.on_close()
+        self._finish()
+        self._file.close()
+
+    def _finish(self) -> None:
+        """
+        Write whatever the format needs before the file is closed
+        :return: None
+        """
+
+
+class NdjsonWriter(_StreamWriter):
+    """
+    Writes every network event as one JSON object per line.
+    Each line is {"timestamp": ms, "method": ..., "params": ...}, so a file
+    cut short by a crash is readable up to its last complete line.
+    """
+
+    def write_event(self, message: dict, timestamp: float) -> None:
+        """
+        Write one CDP network event
+        :param message: CDP event with method and params
+        :param timestamp: log time in milliseconds since the epoch
+        :return: None
+        """
+        record = {
+            "timestamp": timestamp,
+            "method": message["method"],
+            "params": message.get("params", {}),
+        }
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._written()
+
+
+class HarWriter(_StreamWriter):
+    """
+    Writes a HAR 1.2 document whose entries are appended as requests finish.
+    Only requests still in flight are held in memory.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._requests = {}
+        self._count = 0
+        self._file.write(
+            '{"log":{"version":"1.2","creator":'
+            + json.dumps(HAR_CREATOR)
+            + ',"pages":[],"entries":[\n'
+        )
+
+    def write_event(self, message: dict, timestamp: float) -> None:
+        """
+        Fold one CDP network event into its HAR entry
+        :param message: CDP event with method and params
+        :param timestamp: log time in milliseconds since the epoch
+        :return: None
+        """
+        method = message["method"]
+        params = message.get("params", {})
+        request_id = params.get("requestId")
+        if request_id is None:
+            return
+        if method == "Network.requestWillBeSent":
+            previous = self._requests.pop(request_id, None)
+            if previous is not None and params.get("redirectResponse"):
+                previous["response"] = params["redirectResponse"]
+                previous["end"] = params.get("timestamp")
+                self._write_entry(previous)
+            self._requests[request_id] = {"request": params}
+            return
+        state = self._requests.get(request_id)
+        if state is None:
+            return
+        if method == "Network.responseReceived":
+            state["response"] = params.get("response", {})
+            state["type"] = params.get("type")
+        elif method == "Network.dataReceived":
+            state["decoded"] = state.get("decoded", 0) + params.get("dataLength", 0)
+        elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+            state["end"] = params.get("timestamp")
+            state["encoded"] = params.get("encodedDataLength")
+            state["error"] = params.get("errorText")
+            self._write_entry(self._requests.pop(request_id))
+
+    def _write_entry(self, state: dict) -> None:
+        """
+        Append one HAR entry to the document
+        :param state: collected request/response params
+        :return: None
+        """
+        prefix = ",\n" if self._count else ""
+        self._file.write(prefix + json.dumps(har_entry(state), separators=(",", ":")))
+        self._count += 1
+        self._written()
+
+    def _finish(self) -> None:
+        """
+        Write requests still in flight and terminate the document
+        :return: None
+        """
+        for state in list(self._requests.values()):
+            self._write_entry(state)
+        self._requests.clear()
+        self._file.write("\n]}}\n")
+
+
+def open_writer(path: str, format: Optional[str] = None, **kwargs) -> _StreamWriter:
+    """
+    Open a traffic writer for a path
+    :param path: file path, ending in .gz for gzip compression
+    :param format: "har" or "ndjson", inferred from the path when omitted
+    :param kwargs: compress, flush_every, flush_interval
+    :return: writer
+    """
+    format = format or _format_of(path)
+    if format == "har":
+        return HarWriter(path, **kwargs)
+    if format == "ndjson":
+        return NdjsonWriter(path, **kwargs)
+    raise ValueError(f"Unknown traffic format: {format}")
+
+
+def _headers(headers: Optional[dict]) -> list:
+    """
+    Convert a CDP header dictionary to HAR name/value pairs
+    :param headers: CDP headers
+    :return: HAR headers
+    """
+    return [{"name": name, "value": value} for name, value in (headers or {}).items()]
+
+
+def _span(timing: dict, start: str, end: str) -> float:
+    """
+    Duration between two ResourceTiming offsets, -1 when either is missing
+    :param timing: CDP ResourceTiming
+    :param start: start field
+    :param end: end field
+    :return: milliseconds
+    """
+    if timing.get(start, -1) < 0 or timing.get(end, -1) < 0:
+        return -1
+    return timing[end] - timing[start]
+
+
+def har_entry(state: dict) -> dict:
+    """
+    Build a HAR 1.2 entry from collected CDP params
+    :param state: {"request": requestWillBeSent params, "response": ...,
+        "type": ..., "end": ..., "encoded": ..., "decoded": ..., "error": ...}
+    :return: HAR entry
+    """
+    sent = state["request"]
+    request = sent.get("request", {})
+    response = state.get("response") or {}
+    timing = response.get("timing") or {}
+    start = sent.get("timestamp")
+    end = state.get("end")
+    wall_time = sent.get("wallTime") or time.time()
+
+    timings = {"blocked": -1, "dns": -1, "connect": -1, "ssl": -1}
+    timings.update(send=0, wait=0, receive=0)
+    if timing:
+        request_time = timing.get("requestTime", start)
+        if start is not None:
+            timings["blocked"] = max(0.0, (request_time - start) * 1000)
+        timings["dns"] = _span(timing, "dnsStart", "dnsEnd")
+        timings["connect"] = _span(timing, "connectStart", "connectEnd")
+        timings["ssl"] = _span(timing, "sslStart", "sslEnd")
+        timings["send"] = max(0.0, _span(timing, "sendStart", "sendEnd"))
+        timings["wait"] = max(0.0, _span(timing, "sendEnd", "receiveHeadersEnd"))
+        if end is not None:
+            headers_at = request_time + timing.get("receiveHeadersEnd", 0) / 1000
+            timings["receive"] = max(0.0, (end - headers_at) * 1000)
+    elif start is not None and end is not None:
+        timings["wait"] = max(0.0, (end - start) * 1000)
+
+    url = request.get("url", "")
+    headers = response.get("headers") or {}
+    post_data = request.get("postData")
+    entry = {
+        "startedDateTime": datetime.fromtimestamp(wall_time, timezone.utc).isoformat(),
+        # ssl is already part of connect, HAR 1.2 excludes it from the total.
+        "time": sum(
+            value for name, value in timings.items() if name != "ssl" and value > 0
+        ),
+        "request": {
+            "method": request.get("method", "GET"),
+            "url": url,
+            "httpVersion": response.get("protocol", ""),
+            "cookies": [],
+            "headers": _headers(request.get("headers")),
+            "queryString": [
+                {"name": name, "value": value}
+                for name, value in parse_qsl(urlsplit(url).query, True)
+            ],
+            "headersSize": -1,
+            "bodySize": len(post_data) if post_data else 0,
+        },
+        "response": {
+            "status": response.get("status", 0),
+            "statusText": response.get("statusText", ""),
+            "httpVersion": response.get("protocol", ""),
+            "cookies": [],
+            "headers": _headers(headers),
+            "content": {
+                "size": state.get("decoded", -1),
+                "mimeType": response.get("mimeType", ""),
+            },
+            "redirectURL": headers.get("location", headers.get("Location", "")),
+            "headersSize": -1,
+            "bodySize": state["encoded"] if state.get("encoded") is not None else -1,
+        },
+        "cache": {},
+        "timings": timings,
+        "_requestId": sent.get("requestId"),
+        "_resourceType": state.get("type") or sent.get("type"),
+        "_initiator": sent.get("initiator"),
+        "_timestamp": start,
+        "_endTimestamp": end,
+        "_timing": timing or None,
+    }
+    if post_data:
+        entry["request"]["postData"] = {
+            "mimeType": (request.get("headers") or {}).get("Content-Type", ""),
+            "text": post_data,
+        }
+    if state.get("error"):
+        entry["_error"] = state["error"]
+    return entry
+
+
+def read_traffic(path: str, format: Optional[str] = None) -> Iterator[dict]:
+    """
+    Read an exported file back as performance log entries
+    Entries have the shape returned by driver.get_log("performance"), so
+    they can be fed straight into a NetworkTracker.
+    :param path: file path, gzip compressed when it ends in .gz
+    :param format: "har" or "ndjson", inferred from the path when omitted
+    :return: iterator of log entries
+    """
+    format = format or _format_of(path)
+    if format == "ndjson":
+        for line in _read_lines(path):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A crash can leave the last line incomplete.
+                break
+            yield _log_entry(record["method"], record["params"], record["timestamp"])
+        return
+    if format != "har":
+        raise ValueError(f"Unknown traffic format: {format}")
+    text = b"".join(_read_chunks(path)).decode("utf-8", "replace")
+    try:
+        entries = json.loads(text)["log"]["entries"]
+    except ValueError:
+        entries = _complete_har_entries(text)
+    for index, entry in enumerate(entries):
+        yield from _har_events(entry, index)
+
+
+def _read_chunks(path: str, size: int = 1 << 16) -> Iterator[bytes]:
+    """
+    Read a file in binary chunks, gzip decompressed when it ends in .gz
+    A gzip stream cut short by a crash, or corrupt past some point, ends
+    the iteration after the last data that could be decompressed.
+    :param path: file path
+    :param size: chunk size
+    :return: iterator of bytes
+    """
+    with open(path, "rb") as file:
+        if not path.endswith(".gz"):
+            yield from iter(lambda: file.read(size), b"")
+            return
+        # zlib instead of GzipFile: GzipFile raises EOFError on a truncated
+        # stream and drops the data it had not returned yet.
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        for data in iter(lambda: file.read(size), b""):
+            try:
+                chunk = decompressor.decompress(data)
+                while decompressor.eof and decompressor.unused_data:
+                    data = decompressor.unused_data
+                    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                    chunk += decompressor.decompress(data)
+            except zlib.error:
+                return
+            yield chunk
+
+
+def _read_lines(path: str) -> Iterator[str]:
+    """
+    Read the lines of a file, see _read_chunks
+    :param path: file path
+    :return: iterator of lines without their line break
+    """
+    pending = b""
+    for chunk in _read_chunks(path):
+        *lines, pending = (pending + chunk).split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8")
+    if pending:
+        yield pending.decode("utf-8", "replace")
+
+
+def _complete_har_entries(text: str) -> list:
+    """
+    Entries of a HarWriter document cut short by a crash
+    HarWriter writes every entry on a line of its own, so the complete
+    entries are the lines before the first one that does not parse.
+    :param text: document text
+    :return: HAR entries
+    """
+    start = text.find('"entries":[\n')
+    if start < 0:
+        raise ValueError("Not a SeleniumWise HAR document")
+    entries = []
+    for line in text[start:].split("\n")[1:]:
+        if not line.startswith("{"):
+            break
+        try:
+            entries.append(json.loads(line.rstrip(",")))
+        except ValueError:
+            break
+    return entries
+
+
+def _log_entry(method: str, params: dict, timestamp: float) -> dict:
+    """
+    Wrap a CDP event the way driver.get_log("performance") returns it
+    :param method: CDP method
+    :param params: CDP params
+    :param timestamp: log time in milliseconds since the epoch
+    :return: log entry
+    """
+    message = {"message": {"method": method, "params": params}}
+    return {"message": json.dumps(message), "timestamp": timestamp, "level": "INFO"}
+
+
+def _parse_datetime(value: str) -> datetime:
+    """
+    Parse an ISO 8601 date, including the "Z" suffix used by DevTools HARs
+    that datetime.fromisoformat only accepts from Python 3.11
+    :param value: ISO 8601 date
+    :return: datetime
+    """
+    if value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+def _har_events(entry: dict, index: int) -> Iterator[dict]:
+    """
+    Rebuild the CDP lifecycle events of one HAR entry
+    :param entry: HAR entry
+    :param index: position of the entry, the request id of entries without
+        a _requestId, as written by other tools
+    :return: iterator of log entries
+    """
+    started = _parse_datetime(entry["startedDateTime"]).timestamp()
+    request_id = entry.get("_requestId") or f"har-{index}"
+    start = entry.get("_timestamp") or started
+    end = entry.get("_endTimestamp")
+    if end is None:
+        end = start + entry.get("time", 0) / 1000
+    logged = started * 1000
+    request = entry["request"]
+    response = entry["response"]
+    resource_type = entry.get("_resourceType")
+    yield _log_entry(
+        "Network.requestWillBeSent",
+        {
+            "requestId": request_id,
+            "timestamp": start,
+            "wallTime": started,
+            "type": resource_type,
+            "initiator": entry.get("_initiator") or {"type": "other"},
+            "request": {
+                "url": request["url"],
+                "method": request["method"],
+                "headers": {h["name"]: h["value"] for h in request["headers"]},
+            },
+        },
+        logged,
+    )
+    if response.get("status"):
+        yield _log_entry(
+            "Network.responseReceived",
+            {
+                "requestId": request_id,
+                "timestamp": end,
+                "type": resource_type,
+                "response": {
+                    "url": request["url"],
+                    "status": response["status"],
+                    "statusText": response.get("statusText", ""),
+                    "protocol": response.get("httpVersion", ""),
+                    "mimeType": response["content"].get("mimeType", ""),
+                    "headers": {h["name"]: h["value"] for h in response["headers"]},
+                    "timing": entry.get("_timing"),
+                },
+            },
+            logged,
+        )
+    # Requests exported while still in flight carry no end timestamp; HAR
+    # files from other tools do not have the private fields at all.
+    if entry.get("_endTimestamp") is None and "_requestId" in entry:
+        return
+    if entry.get("_error"):
+        yield _log_entry(
+            "Network.loadingFailed",
+            {
+                "requestId": request_id,
+                "timestamp": end,
+                "type": resource_type,
+                "errorText": entry["_error"],
+            },
+            logged,
+        )
+    else:
+        yield _log_entry(
+            "Network.loadingFinished",
+            {
+                "requestId": request_id,
+                "timestamp": end,
+                "encodedDataLength": response.get("bodySize", -1),
+            },
+            logged,
+        )
@@ -0,0 +1,237 @@
+"""
+The Module holds the record types built by the NetworkTracker.
+"""
+import json
+import sys
+from typing import Optional
+
+
+def _intern(value):
+    """
+    Intern strings so repeated urls and mime types share one object
+    :param value: value to intern
+    :return: interned string, or the value unchanged
+    """
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class NetworkEntry:
+    """
+    Compact record of one Network.response* event.
+
+    Only the fields that are queried are kept as attributes; repeated
+    strings (url, type, mime type, method) are interned. The full CDP
+    payload is kept as the raw log text; the NetworkTracker keeps the parsed
+    event of its most recent entries, every other ``raw`` access parses the
+    text again.
+    """
+
+    __slots__ = (
+        "method",
+        "request_id",
+        "url",
+        "status",
+        "type",
+        "mime_type",
+        "timestamp",
+        "request_time",
+        "ttfb",
+        "encoded_data_length",
+        "_text",
+        "_message",
+    )
+
+    def __init__(self, message: dict, text: str, timestamp: float):
+        params = message.get("params", {})
+        response = params.get("response")
+        self.method = _intern(message["method"])
+        self.request_id = params.get("requestId")
+        self.type = _intern(params.get("type"))
+        self.timestamp = timestamp
+        self._text = text
+        self._message = None
+        if response is None:
+            self.url = self.status = self.mime_type = None
+            self.request_time = self.ttfb = self.encoded_data_length = None
+            return
+        timing = response.get("timing") or {}
+        self.url = _intern(response.get("url"))
+        self.status = response.get("status")
+        self.mime_type = _intern(response.get("mimeType"))
+        self.request_time = timing.get("requestTime")
+        if "sendStart" in timing and "receiveHeadersEnd" in timing:
+            self.ttfb = timing["receiveHeadersEnd"] - timing["sendStart"]
+        else:
+            self.ttfb = None
+        self.encoded_data_length = response.get("encodedDataLength")
+
+    def __repr__(self):
+        return f"NetworkEntry({self.method!r}, {self.url!r}, status={self.status!r})"
+
+    @property
+    def raw(self) -> dict:
+        """
+        Full CDP event, parsed from the raw log text unless it is cached
+        :return: dict with method and params
+        """
+        if self._message is not None:
+            return self._message
+        return json.loads(self._text)["message"]
+
+    @property
+    def headers(self) -> dict:
+        """
+        Response headers, parsed from the raw log text
+        :return: dict
+        """
+        response = self.raw.get("params", {}).get("response") or {}
+        return response.get("headers") or {}
+
+
+class RequestRecord:
+    """
+    One network request, joined from its CDP lifecycle events by requestId.
+
+    Timestamps are CDP monotonic seconds; durations are milliseconds and are
+    None while the events needed to compute them have not been seen.
+    """
+
+    __slots__ = (
+        "request_id",
+        "url",
+        "method",
+        "resource_type",
+        "initiator",
+        "wall_time",
+        "logged_at",
+        "start_time",
+        "request_time",
+        "send_start",
+        "receive_headers_end",
+        "end_time",
+        "status",
+        "mime_type",
+        "encoded_size",
+        "decoded_size",
+        "failed",
+        "error_text",
+    )
+
+    def __init__(self, request_id: str, logged_at: float):
+        self.request_id = request_id
+        self.url = None
+        self.method = None
+        self.resource_type = None
+        self.initiator = None
+        self.wall_time = None
+        self.logged_at = logged_at
+        self.start_time = None
+        self.request_time = None
+        self.send_start = None
+        self.receive_headers_end = None
+        self.end_time = None
+        self.status = None
+        self.mime_type = None
+        self.encoded_size = None
+        self.decoded_size = None
+        self.failed = False
+        self.error_text = None
+
+    def __repr__(self):
+        return (
+            f"RequestRecord({self.request_id!r}, {self.url!r}, "
+            f"status={self.status!r}, duration={self.duration!r})"
+        )
+
+    @property
+    def finished(self) -> bool:
+        """
+        Whether loadingFinished or loadingFailed was seen
+        :return: bool
+        """
+        return self.end_time is not None
+
+    @property
+    def queued(self) -> Optional[float]:
+        """
+        Time between requestWillBeSent and the request actually starting
+        :return: milliseconds
+        """
+        if self.start_time is None or self.request_time is None:
+            return None
+        return max(0.0, (self.request_time - self.start_time) * 1000)
+
+    @property
+    def ttfb(self) -> Optional[float]:
+        """
+        Time from sending the request to receiving the response headers
+        :return: milliseconds
+        """
+        if self.send_start is None or self.receive_headers_end is None:
+            return None
+        return self.receive_headers_end - self.send_start
+
+    @property
+    def download(self) -> Optional[float]:
+        """
+        Time from receiving the response headers to the end of loading
+        :return: milliseconds
+        """
+        if (
+            self.end_time is None
+            or self.request_time is None
+            or self.receive_headers_end is None
+        ):
+            return None
+        headers_at = self.request_time + self.receive_headers_end / 1000
+        return max(0.0, (self.end_time - headers_at) * 1000)
+
+    @property
+    def duration(self) -> Optional[float]:
+        """
+        Time from requestWillBeSent to the end of loading
+        :return: milliseconds
+        """
+        if self.start_time is None or self.end_time is None:
+            return None
+        return (self.end_time - self.start_time) * 1000
+
+    @property
+    def initiator_url(self) -> Optional[str]:
+        """
+        URL of the document or script that issued the request
+        :return: url
+        """
+        initiator = self.initiator or {}
+        if initiator.get("url"):
+            return initiator["url"]
+        stack = initiator.get("stack")
+        while stack:
+            for frame in stack.get("callFrames", ()):
+                if frame.get("url"):
+                    return frame["url"]
+            stack = stack.get("parent")
+        return None
+
+    def as_dict(self) -> dict:
+        """
+        Plain dictionary view including the derived durations
+        :return: dict
+        """
+        return {
+            "request_id": self.request_id,
+            "url": self.url,
+            "method": self.method,
+            "type": self.resource_type,
+            "status": self.status,
+            "mime_type": self.mime_type,
+            "initiator": self.initiator_url,
+            "queued": self.queued,
+            "ttfb": self.ttfb,
+            "download": self.download,
+            "duration": self.duration,
+            "encoded_size": self.encoded_size,
+            "decoded_size": self.decoded_size,
+            "failed": self.failed,
+            "error_text": self.error_text,
+        }
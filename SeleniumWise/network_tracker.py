@@ -3,77 +3,632 @@ The Module is used to track the network traffic of the browser.
 """
 import logging
 import json
-from typing import Any
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from fnmatch import fnmatchcase
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+from selenium.common.exceptions import TimeoutException
+
+from SeleniumWise.errors import ErrorPolicy, NetworkTrackingError, guarded
+from SeleniumWise.network_export import open_writer, read_traffic
+from SeleniumWise.network_records import NetworkEntry, RequestRecord
+
+# Cheap substring tests applied to the raw log message before json.loads.
+# Every event the tracker consumes carries one of them, most others do not.
+_RESPONSE_MARKER = '"Network.response'
+_LIFECYCLE_MARKERS = ('"Network.requestWillBeSent', '"Network.loading')
+_DATA_MARKER = '"Network.dataReceived'
+
+
+class _Bucket:
+    """
+    Index bucket with O(1) append and O(1) removal from the front.
+    A deque costs a fixed block of several hundred bytes even for the single
+    entry of a requestId bucket; a list with a moving start offset does not.
+    """
+
+    __slots__ = ("_items", "_start")
+
+    def __init__(self):
+        self._items = []
+        self._start = 0
+
+    def __len__(self):
+        return len(self._items) - self._start
+
+    def __iter__(self):
+        return islice(self._items, self._start, None)
+
+    def append(self, item) -> None:
+        self._items.append(item)
+
+    def popleft(self):
+        item = self._items[self._start]
+        self._items[self._start] = None
+        self._start += 1
+        if self._start * 2 >= len(self._items):
+            del self._items[: self._start]
+            self._start = 0
+        return item
 
 
 class NetworkTracker:
     """
     The Class is used to track the network traffic of the browser.
+
+    Reading the performance log drains the browser's buffer, so every read is
+    accumulated into a per-session store. The store is indexed by url, status,
+    resource type and requestId, which keeps repeated queries cheap and
+    guarantees that one query never hides entries from the next.
+
+    The store can be bounded with ``max_entries`` and ``max_age`` (seconds);
+    the oldest entries are evicted first. Used as a context manager the
+    tracker drains the log on a background thread every ``drain_interval``
+    seconds, so the browser buffer never overflows between assertions.
+
+    Entries are kept as compact NetworkEntry records holding the raw log
+    text; the get_network_traffic* methods return the parsed CDP events as
+    before, get_entries() and query(records=True) return the records. The
+    parsed events of the ``parsed_cache_size`` most recent entries are kept,
+    so repeated queries over them never parse again; older entries are
+    parsed on each read.
+
+    Lifecycle events are joined by requestId into RequestRecord objects that
+    carry per-request timings and sizes. Decoded sizes need the high-volume
+    Network.dataReceived events and are only tracked with
+    ``track_decoded_sizes=True``.
+
+    ``error_policy`` decides what a failing query does: log and return None
+    (the default), raise a NetworkTrackingError, or retry first.
     """
 
-    def __init__(self, driver):
+    def __init__(
+        self,
+        driver,
+        max_entries: Optional[int] = None,
+        max_age: Optional[float] = None,
+        drain_interval: float = 1.0,
+        track_decoded_sizes: bool = False,
+        error_policy: Optional[ErrorPolicy] = None,
+        parsed_cache_size: int = 10000,
+    ):
         self.driver = driver
+        self.error_policy = error_policy or ErrorPolicy()
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.drain_interval = drain_interval
+        self.track_decoded_sizes = track_decoded_sizes
+        self.parsed_cache_size = parsed_cache_size
+        self._lock = threading.RLock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._pending = deque()
+        self._entries = deque()
+        self._parsed = deque()
+        self._requests = {}
+        self._inflight = {}
+        self._activity = None
+        self._sinks = []
+        self._by_url = defaultdict(_Bucket)
+        self._by_status = defaultdict(_Bucket)
+        self._by_type = defaultdict(_Bucket)
+        self._by_request_id = defaultdict(_Bucket)
+        self._by_url_and_status = defaultdict(_Bucket)
 
-    def get_network_traffic(self) -> list[Any]:
+    def __enter__(self):
+        self.start_background_drain()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop_background_drain()
+
+    def start_background_drain(self, interval: Optional[float] = None) -> None:
         """
-        Get network traffic
-        :return: network traffic
+        Start draining the performance log on a background thread
+        :param interval: seconds between drains, defaults to drain_interval
+        :return: None
         """
+        if self._thread is not None:
+            return
+        if interval is not None:
+            self.drain_interval = interval
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._drain_loop, name="NetworkTracker-drain", daemon=True
+        )
+        self._thread.start()
+
+    def stop_background_drain(self) -> None:
+        """
+        Stop the background thread after one final drain
+        :return: None
+        """
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
         try:
-            entries = self.driver.get_log("performance")
-            entries = [json.loads(entry["message"])["message"] for entry in entries]
-            entries = [
-                entry for entry in entries if "Network.response" in entry["method"]
-            ]
-            return entries
+            self.collect()
         except Exception as error:
             logging.error(f"Operation Failed: {error}")
 
+    def _drain_loop(self) -> None:
+        """
+        Background thread body
+        :return: None
+        """
+        while not self._stop_event.wait(self.drain_interval):
+            try:
+                self.collect()
+            except Exception as error:
+                logging.error(f"Operation Failed: {error}")
+
+    @classmethod
+    def from_file(cls, path: str, format: Optional[str] = None, **kwargs):
+        """
+        Build an offline tracker from an exported HAR or JSON-lines file
+        :param path: file path
+        :param format: "har" or "ndjson", inferred from the path when omitted
+        :param kwargs: NetworkTracker options
+        :return: NetworkTracker without a driver
+        """
+        tracker = cls(None, **kwargs)
+        tracker.load(path, format)
+        return tracker
+
+    def load(self, path: str, format: Optional[str] = None) -> int:
+        """
+        Add the traffic of an exported HAR or JSON-lines file to the store
+        :param path: file path
+        :param format: "har" or "ndjson", inferred from the path when omitted
+        :return: number of new network entries
+        """
+        with self._lock:
+            self._pending.extend(read_traffic(path, format))
+            return self.collect()
+
+    def stream_to(self, path: str, format: Optional[str] = None, **kwargs):
+        """
+        Stream every network event consumed from now on to a file
+        :param path: file path, ending in .gz for gzip compression
+        :param format: "har" or "ndjson", inferred from the path when omitted
+        :param kwargs: compress, flush_every, flush_interval
+        :Example: with tracker.stream_to("traffic.har.gz"): ...
+        :return: writer, close it (or use it as a context manager) to finish
+        """
+        writer = open_writer(path, format, **kwargs)
+        writer.on_close = lambda: self._detach(writer)
+        with self._lock:
+            self._sinks.append(writer)
+        return writer
+
+    def _detach(self, writer) -> None:
+        """
+        Drain the log one last time into a writer and stop streaming to it
+        :param writer: writer returned by stream_to
+        :return: None
+        """
+        with self._lock:
+            try:
+                self.collect()
+            except Exception as error:
+                logging.error(f"Operation Failed: {error}")
+            if writer in self._sinks:
+                self._sinks.remove(writer)
+
+    def collect(self) -> int:
+        """
+        Drain the browser performance log into the store
+        :return: number of new network entries
+        """
+        with self._lock:
+            self._fetch()
+            count = 0
+            for _ in self._drain_pending():
+                count += 1
+            self._evict()
+            return count
+
+    def snapshot(self) -> list[Any]:
+        """
+        Thread-safe copy of the collected entries, without draining the log
+        :return: network traffic
+        """
+        with self._lock:
+            self._evict()
+            return [entry.raw for entry in self._entries]
+
+    def iter_network_traffic(self) -> Iterator[Any]:
+        """
+        Lazily iterate over network traffic, already collected entries first
+        Raw log messages are only parsed when the generator reaches them, so
+        a caller that stops early never pays for the rest of the log.
+        :return: network traffic iterator
+        """
+        with self._lock:
+            self._fetch()
+            stored = list(self._entries)
+        yield from (entry.raw for entry in stored)
+        yield from self._drain_pending()
+
+    def _fetch(self) -> None:
+        """
+        Move the browser performance log into the pending queue
+        :return: None
+        """
+        if self.driver is None:
+            return
+        with self._lock:
+            self._pending.extend(self.driver.get_log("performance"))
+
+    def _drain_pending(self) -> Iterator[Any]:
+        """
+        Parse pending raw log entries, storing and yielding network responses
+        :return: network traffic iterator
+        """
+        while True:
+            with self._lock:
+                message = self._next_pending()
+            if message is None:
+                return
+            yield message
+
+    def _next_pending(self) -> Optional[dict]:
+        """
+        Parse pending raw log entries up to the next network response
+        :return: stored network response, or None when the queue is empty
+        """
+        pending = self._pending
+        while pending:
+            raw = pending.popleft()
+            text = raw["message"]
+            is_response = _RESPONSE_MARKER in text
+            if not (
+                is_response
+                or any(marker in text for marker in _LIFECYCLE_MARKERS)
+                or (self.track_decoded_sizes and _DATA_MARKER in text)
+            ):
+                continue
+            message = json.loads(text)["message"]
+            timestamp = raw.get("timestamp")
+            timestamp = timestamp / 1000 if timestamp else time.time()
+            for sink in self._sinks:
+                sink.write_event(message, timestamp * 1000)
+            self._update_request(message, timestamp)
+            if is_response and "Network.response" in message["method"]:
+                entry = NetworkEntry(message, text, timestamp)
+                self._add(entry)
+                self._cache_message(entry, message)
+                return message
+        return None
+
+    def _cache_message(self, entry: NetworkEntry, message: dict) -> None:
+        """
+        Keep the parsed event of a new entry, dropping the oldest cached one
+        beyond parsed_cache_size
+        :param entry: network entry, newest in the store
+        :param message: its parsed CDP event
+        :return: None
+        """
+        if self.parsed_cache_size <= 0:
+            return
+        entry._message = message
+        self._parsed.append(entry)
+        if len(self._parsed) > self.parsed_cache_size:
+            self._parsed.popleft()._message = None
+
+    def _update_request(self, message: dict, timestamp: float) -> None:
+        """
+        Fold one lifecycle event into its RequestRecord
+        :param message: CDP network event
+        :param timestamp: log time in seconds since the epoch
+        :return: None
+        """
+        method = message["method"]
+        params = message.get("params", {})
+        request_id = params.get("requestId")
+        if request_id is None:
+            return
+        record = self._requests.get(request_id)
+        if method == "Network.requestWillBeSent":
+            if record is None:
+                record = self._requests[request_id] = RequestRecord(
+                    request_id, timestamp
+                )
+                record.start_time = params.get("timestamp")
+                record.wall_time = params.get("wallTime")
+                record.initiator = params.get("initiator")
+            # A redirect reuses the requestId; keep the first start time and
+            # follow the request to its final url.
+            request = params.get("request", {})
+            record.url = request.get("url")
+            record.method = request.get("method")
+            record.resource_type = params.get("type", record.resource_type)
+            self._inflight[request_id] = record
+            if self._activity is not None:
+                self._activity.append(record.url)
+            return
+        if record is None:
+            return
+        if method == "Network.responseReceived":
+            response = params.get("response", {})
+            timing = response.get("timing") or {}
+            record.resource_type = params.get("type", record.resource_type)
+            record.url = response.get("url", record.url)
+            record.status = response.get("status")
+            record.mime_type = response.get("mimeType")
+            record.request_time = timing.get("requestTime")
+            record.send_start = timing.get("sendStart")
+            record.receive_headers_end = timing.get("receiveHeadersEnd")
+        elif method == "Network.dataReceived":
+            record.decoded_size = (record.decoded_size or 0) + params.get(
+                "dataLength", 0
+            )
+        elif method == "Network.loadingFinished":
+            record.end_time = params.get("timestamp")
+            record.encoded_size = params.get("encodedDataLength")
+        elif method == "Network.loadingFailed":
+            record.end_time = params.get("timestamp")
+            record.resource_type = params.get("type", record.resource_type)
+            record.failed = True
+            record.error_text = params.get("errorText")
+        if record.end_time is not None and self._inflight.pop(request_id, None):
+            if self._activity is not None:
+                self._activity.append(record.url)
+
+    def clear(self) -> None:
+        """
+        Forget every collected entry
+        :return: None
+        """
+        with self._lock:
+            self._pending.clear()
+            self._entries.clear()
+            self._parsed.clear()
+            self._requests.clear()
+            self._inflight.clear()
+            for index in self._indexes():
+                index.clear()
+
+    def _indexes(self) -> tuple:
+        """
+        All index dictionaries of the store
+        :return: tuple of indexes
+        """
+        return (
+            self._by_url,
+            self._by_status,
+            self._by_type,
+            self._by_request_id,
+            self._by_url_and_status,
+        )
+
+    @staticmethod
+    def _index_keys(entry: NetworkEntry) -> list:
+        """
+        Index keys of an entry, in the order of _indexes()
+        :param entry: network entry
+        :return: list of keys, None where the entry is not indexed
+        """
+        has_response = entry.url is not None
+        return [
+            entry.url,
+            entry.status if has_response else None,
+            entry.type,
+            entry.request_id,
+            (entry.url, entry.status) if has_response else None,
+        ]
+
+    def _add(self, entry: NetworkEntry) -> None:
+        """
+        Append an entry to the store and its indexes
+        :param entry: network entry
+        :return: None
+        """
+        self._entries.append(entry)
+        for index, key in zip(self._indexes(), self._index_keys(entry)):
+            if key is not None:
+                index[key].append(entry)
+
+    def _evict(self) -> None:
+        """
+        Drop the oldest entries beyond max_entries or older than max_age
+        :return: None
+        """
+        entries = self._entries
+        cutoff = time.time() - self.max_age if self.max_age is not None else None
+        while entries and (
+            (self.max_entries is not None and len(entries) > self.max_entries)
+            or (cutoff is not None and entries[0].timestamp < cutoff)
+        ):
+            entry = entries.popleft()
+            if self._parsed and self._parsed[0] is entry:
+                self._parsed.popleft()
+            # Entries are evicted in insertion order, so the evicted entry is
+            # the leftmost element of every bucket it was indexed in.
+            for index, key in zip(self._indexes(), self._index_keys(entry)):
+                if key is None:
+                    continue
+                bucket = index[key]
+                bucket.popleft()
+                if not bucket:
+                    del index[key]
+        requests = self._requests
+        while requests:
+            oldest = next(iter(requests.values()))
+            if (self.max_entries is not None and len(requests) > self.max_entries) or (
+                cutoff is not None and oldest.logged_at < cutoff
+            ):
+                del requests[oldest.request_id]
+                self._inflight.pop(oldest.request_id, None)
+            else:
+                break
+
+    def _lookup(self, index: dict, key) -> list[Any]:
+        """
+        Collect new entries and read one index bucket
+        :param index: index to read
+        :param key: bucket key
+        :return: network traffic
+        """
+        with self._lock:
+            self.collect()
+            entries = list(index.get(key, ()))
+        return [entry.raw for entry in entries]
+
+    @guarded(NetworkTrackingError)
+    def query(
+        self,
+        url: Union[str, re.Pattern, None] = None,
+        status: Union[int, str, range, Iterable, None] = None,
+        type: Union[str, Iterable[str], None] = None,
+        mime_type: Union[str, re.Pattern, None] = None,
+        headers: Optional[dict] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        predicate: Optional[Callable[[NetworkEntry], bool]] = None,
+        records: bool = False,
+    ) -> list[Any]:
+        """
+        Get network traffic matching every given filter, in one pass
+        Strings containing ``*`` are fnmatch globs, other strings match
+        exactly and compiled patterns are searched. Header filters parse the
+        raw payload of each candidate, so combine them with cheaper filters.
+        :param url: response url, glob or regex
+        :param status: code, ``"4xx"`` style class, range or iterable of those
+        :param type: resource type or set of resource types
+        :param mime_type: response mime type, glob or regex
+        :param headers: {header name: value}; a value may be a glob, regex,
+            callable predicate, or None to only require the header
+        :param since: earliest log time, seconds since the epoch
+        :param until: latest log time, seconds since the epoch
+        :param predicate: extra callable applied to the NetworkEntry
+        :param records: return NetworkEntry records instead of CDP events
+        :Example: tracker.query(url="*/api/*", status=["4xx", "5xx"])
+        :return: network traffic
+        """
+        checks = []
+        keys = {}
+        if url is not None:
+            if isinstance(url, str) and "*" not in url:
+                keys["url"] = url
+            matches_url = _compile_text(url)
+            checks.append(lambda entry: matches_url(entry.url))
+        if status is not None:
+            statuses = _compile_status(status)
+            if isinstance(status, int):
+                keys["status"] = status
+            checks.append(lambda entry: entry.status in statuses)
+        if type is not None:
+            types = {type} if isinstance(type, str) else set(type)
+            if len(types) == 1:
+                keys["type"] = next(iter(types))
+            checks.append(lambda entry: entry.type in types)
+        if mime_type is not None:
+            matches_mime = _compile_text(mime_type)
+            checks.append(lambda entry: matches_mime(entry.mime_type))
+        for name, expected in (headers or {}).items():
+            checks.append(_header_check(name, expected))
+        if predicate is not None:
+            checks.append(predicate)
+        with self._lock:
+            self.collect()
+            results = []
+            for entry in self._candidates(keys):
+                if since is not None and entry.timestamp < since:
+                    continue
+                if until is not None and entry.timestamp > until:
+                    continue
+                if all(check(entry) for check in checks):
+                    results.append(entry)
+        if records:
+            return results
+        return [entry.raw for entry in results]
+
+    def _candidates(self, keys: dict) -> Iterable:
+        """
+        Pick the smallest index bucket covering the exact-match filters
+        :param keys: exact url, status and type filters
+        :return: network entries
+        """
+        buckets = []
+        if "url" in keys and "status" in keys:
+            buckets.append(
+                self._by_url_and_status.get((keys["url"], keys["status"]), ())
+            )
+        elif "url" in keys:
+            buckets.append(self._by_url.get(keys["url"], ()))
+        elif "status" in keys:
+            buckets.append(self._by_status.get(keys["status"], ()))
+        if "type" in keys:
+            buckets.append(self._by_type.get(keys["type"], ()))
+        if not buckets:
+            return self._entries
+        return min(buckets, key=len)
+
+    @guarded(NetworkTrackingError)
+    def get_network_traffic(self) -> list[Any]:
+        """
+        Get network traffic
+        :return: network traffic
+        """
+        with self._lock:
+            self.collect()
+            entries = list(self._entries)
+        return [entry.raw for entry in entries]
+
+    @guarded(NetworkTrackingError)
+    def get_entries(self) -> list[NetworkEntry]:
+        """
+        Get network traffic as compact NetworkEntry records
+        :return: network entries
+        """
+        with self._lock:
+            self.collect()
+            return list(self._entries)
+
+    @guarded(NetworkTrackingError)
     def get_network_traffic_by_url(self, url: str) -> list[Any]:
         """
         Get network traffic by url
         :param url: url
         :return: network traffic
         """
-        try:
-            entries = self.get_network_traffic()
-            entries = [
-                entry for entry in entries if entry["params"]["response"]["url"] == url
-            ]
-            return entries
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._lookup(self._by_url, url)
 
+    @guarded(NetworkTrackingError)
     def get_network_traffic_by_status(self, status: int) -> list[Any]:
         """
         Get network traffic by status
         :param status: status
         :return: network traffic
         """
-        try:
-            entries = self.get_network_traffic()
-            entries = [
-                entry
-                for entry in entries
-                if entry["params"]["response"]["status"] == status
-            ]
-            return entries
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._lookup(self._by_status, status)
 
+    @guarded(NetworkTrackingError)
     def get_network_traffic_by_type(self, type: str) -> list[Any]:
         """
         Get network traffic by type
         :param type: type
         :return: network traffic
         """
-        try:
-            entries = self.get_network_traffic()
-            entries = [entry for entry in entries if entry["params"]["type"] == type]
-            return entries
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+        return self._lookup(self._by_type, type)
 
+    @guarded(NetworkTrackingError)
+    def get_network_traffic_by_request_id(self, request_id: str) -> list[Any]:
+        """
+        Get network traffic by request id
+        :param request_id: CDP requestId
+        :return: network traffic
+        """
+        return self._lookup(self._by_request_id, request_id)
+
+    @guarded(NetworkTrackingError)
     def get_network_traffic_by_url_and_status(self, url: str, status: int) -> list[Any]:
         """
         Get network traffic by url and status
@@ -81,14 +636,294 @@ class NetworkTracker:
         :param status: status
         :return: network traffic
         """
+        return self._lookup(self._by_url_and_status, (url, status))
+
+    @guarded(NetworkTrackingError)
+    def get_requests(self) -> list[RequestRecord]:
+        """
+        Get request records joined from the network lifecycle events
+        :return: request records in the order they were sent
+        """
+        return self._requests_snapshot()
+
+    def _requests_snapshot(self) -> list[RequestRecord]:
+        """
+        Collect new events and copy the request records
+        :return: request records in the order they were sent
+        """
+        with self._lock:
+            self.collect()
+            return list(self._requests.values())
+
+    @guarded(NetworkTrackingError)
+    def get_request(self, request_id: str) -> RequestRecord:
+        """
+        Get request record by request id
+        :param request_id: CDP requestId
+        :return: request record
+        """
+        with self._lock:
+            self.collect()
+            return self._requests.get(request_id)
+
+    @guarded(NetworkTrackingError)
+    def get_request_waterfall(self) -> list[dict]:
+        """
+        Get the request waterfall
+        Each row is RequestRecord.as_dict() plus ``start``, the offset in
+        milliseconds from the first request, sorted by start.
+        :return: waterfall rows
+        """
+        records = [r for r in self._requests_snapshot() if r.start_time is not None]
+        records.sort(key=lambda record: record.start_time)
+        if not records:
+            return []
+        origin = records[0].start_time
+        rows = []
+        for record in records:
+            row = record.as_dict()
+            row["start"] = (record.start_time - origin) * 1000
+            rows.append(row)
+        return rows
+
+    @guarded(NetworkTrackingError)
+    def get_slowest_requests(self, count: int = 10) -> list[RequestRecord]:
+        """
+        Get the slowest finished requests
+        :param count: number of requests
+        :return: request records, slowest first
+        """
+        return _slowest(self._requests_snapshot(), count)
+
+    @guarded(NetworkTrackingError)
+    def get_bytes_by_type(self, decoded: bool = False) -> dict:
+        """
+        Get total transferred bytes per resource type
+        :param decoded: sum decoded sizes instead of encoded sizes
+        :return: {resource type: bytes}
+        """
+        return _bytes_by_type(self._requests_snapshot(), decoded)
+
+    @guarded(NetworkTrackingError)
+    def get_critical_path(self) -> list[RequestRecord]:
+        """
+        Get the initiator chain that finishes last relative to where it began
+        A request's parent is the request that fetched its initiator url.
+        :return: request records from the root of the chain to its leaf
+        """
+        return _critical_path(self._requests_snapshot())
+
+    @guarded(NetworkTrackingError)
+    def get_critical_path_length(self) -> float:
+        """
+        Get the duration of the critical path
+        :return: milliseconds
+        """
+        return _path_length(_critical_path(self._requests_snapshot()))
+
+    @guarded(NetworkTrackingError)
+    def get_request_summary(self, count: int = 10) -> dict:
+        """
+        Get a summary of the captured requests
+        :param count: number of slowest requests to include
+        :return: summary dictionary
+        """
+        records = self._requests_snapshot()
+        return {
+            "requests": len(records),
+            "failed": sum(1 for record in records if record.failed),
+            "bytes_by_type": _bytes_by_type(records),
+            "slowest": [r.as_dict() for r in _slowest(records, count)],
+            "critical_path_length": _path_length(_critical_path(records)),
+        }
+
+    @guarded(NetworkTrackingError, default=False, soft=(TimeoutException,))
+    def wait_for_network_idle(
+        self,
+        idle_ms: float = 500,
+        max_inflight: int = 0,
+        timeout: float = 30,
+        include: Optional[Iterable] = None,
+        exclude: Optional[Iterable] = None,
+        poll_interval: float = 0.05,
+    ) -> bool:
+        """
+        Wait until at most max_inflight requests are pending for idle_ms
+        Requests are tracked from requestWillBeSent to loadingFinished or
+        loadingFailed; any start or finish of a selected request restarts
+        the quiet window.
+        :param idle_ms: length of the quiet window in milliseconds
+        :param max_inflight: number of pending requests still considered idle
+        :param timeout: maximum time to wait in seconds
+        :param include: url patterns to track, all urls when omitted
+        :param exclude: url patterns to ignore, e.g. analytics or long-polls
+        :param poll_interval: seconds between performance log reads
+        :Example: tracker.wait_for_network_idle(exclude=["*/collect?*"])
+        :return: True when idle, False on timeout (WaitTimeoutError when
+            the error policy raises)
+        """
+        includes = [_compile_text(pattern) for pattern in include or ()]
+        excludes = [_compile_text(pattern) for pattern in exclude or ()]
+
+        def selected(url):
+            if includes and not any(check(url) for check in includes):
+                return False
+            return not any(check(url) for check in excludes)
+
         try:
-            entries = self.get_network_traffic()
-            entries = [
-                entry
-                for entry in entries
-                if entry["params"]["response"]["url"] == url
-                and entry["params"]["response"]["status"] == status
-            ]
-            return entries
-        except Exception as error:
-            logging.error(f"Operation Failed: {error}")
+            now = time.monotonic()
+            deadline = now + timeout
+            quiet_since = now
+            with self._lock:
+                self._activity = []
+            while True:
+                with self._lock:
+                    self.collect()
+                    active = any(selected(url) for url in self._activity)
+                    self._activity.clear()
+                    inflight = sum(
+                        1 for record in self._inflight.values() if selected(record.url)
+                    )
+                now = time.monotonic()
+                if active or inflight > max_inflight:
+                    quiet_since = now
+                elif (now - quiet_since) * 1000 >= idle_ms:
+                    return True
+                if now >= deadline:
+                    raise TimeoutException(
+                        f"network not idle after {timeout}s, "
+                        f"{inflight} request(s) in flight"
+                    )
+                remaining = idle_ms / 1000 - (now - quiet_since)
+                time.sleep(max(0.0, min(poll_interval, remaining, deadline - now)))
+        finally:
+            with self._lock:
+                self._activity = None
+
+
+def _slowest(records: list, count: int) -> list[RequestRecord]:
+    """
+    The slowest finished requests
+    :param records: request records
+    :param count: number of requests
+    :return: request records, slowest first
+    """
+    records = [r for r in records if r.duration is not None]
+    records.sort(key=lambda record: record.duration, reverse=True)
+    return records[:count]
+
+
+def _bytes_by_type(records: list, decoded: bool = False) -> dict:
+    """
+    Total transferred bytes per resource type
+    :param records: request records
+    :param decoded: sum decoded sizes instead of encoded sizes
+    :return: {resource type: bytes}
+    """
+    totals = defaultdict(int)
+    for record in records:
+        size = record.decoded_size if decoded else record.encoded_size
+        if size:
+            totals[record.resource_type] += size
+    return dict(totals)
+
+
+def _critical_path(records: list) -> list[RequestRecord]:
+    """
+    The initiator chain that finishes last relative to where it began
+    :param records: request records
+    :return: request records from the root of the chain to its leaf
+    """
+    records = [
+        r for r in records if r.start_time is not None and r.end_time is not None
+    ]
+    by_url = {}
+    for record in records:
+        by_url.setdefault(record.url, record)
+    chains = {}
+
+    def chain(record):
+        if record.request_id not in chains:
+            chains[record.request_id] = [record]
+            parent = by_url.get(record.initiator_url)
+            if parent is not None and parent is not record:
+                chains[record.request_id] = chain(parent) + [record]
+        return chains[record.request_id]
+
+    best = []
+    best_length = -1.0
+    for record in records:
+        path = chain(record)
+        length = path[-1].end_time - path[0].start_time
+        if length > best_length:
+            best, best_length = path, length
+    return best
+
+
+def _path_length(path: list) -> float:
+    """
+    Duration of a request chain
+    :param path: request records from root to leaf
+    :return: milliseconds
+    """
+    if not path:
+        return 0.0
+    return (path[-1].end_time - path[0].start_time) * 1000
+
+
+def _compile_text(pattern: Union[str, re.Pattern]) -> Callable[[Any], bool]:
+    """
+    Build a matcher for an exact string, fnmatch glob or compiled regex
+    :param pattern: pattern
+    :return: matcher
+    """
+    if isinstance(pattern, re.Pattern):
+        return lambda value: isinstance(value, str) and bool(pattern.search(value))
+    if "*" in pattern:
+        return lambda value: isinstance(value, str) and fnmatchcase(value, pattern)
+    return lambda value: value == pattern
+
+
+def _compile_status(status: Union[int, str, range, Iterable]) -> set:
+    """
+    Expand a status filter into the set of matching codes
+    :param status: code, "5xx" style class, range or iterable of those
+    :return: set of status codes
+    """
+    if isinstance(status, int):
+        return {status}
+    if isinstance(status, range):
+        return set(status)
+    if isinstance(status, str):
+        if len(status) == 3 and status[0].isdigit() and status[1:].lower() == "xx":
+            start = int(status[0]) * 100
+            return set(range(start, start + 100))
+        return {int(status)}
+    codes = set()
+    for item in status:
+        codes |= _compile_status(item)
+    return codes
+
+
+def _header_check(name: str, expected) -> Callable:
+    """
+    Build an entry predicate for one response header
+    :param name: header name, case-insensitive
+    :param expected: glob, regex, callable, or None for presence only
+    :return: entry predicate
+    """
+    name = name.lower()
+    if expected is None:
+        check = None
+    elif callable(expected) and not isinstance(expected, re.Pattern):
+        check = expected
+    else:
+        check = _compile_text(expected)
+
+    def matches(entry: NetworkEntry) -> bool:
+        for key, value in entry.headers.items():
+            if key.lower() == name:
+                return check is None or bool(check(value))
+        return False
+
+    return matches
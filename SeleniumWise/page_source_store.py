@@ -0,0 +1,324 @@
+"""
+The Module archives page source snapshots as compressed line deltas.
+"""
+import difflib
+import json
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import List, Optional
+
+_LENGTH = struct.Struct(">I")
+
+
+class _Snapshot:
+    """
+    Index entry of one stored snapshot.
+    """
+
+    __slots__ = ("id", "url", "timestamp", "base", "offset", "length", "size")
+
+    def __init__(self, id, url, timestamp, base, offset, length, size):
+        self.id = id
+        self.url = url
+        self.timestamp = timestamp
+        self.base = base
+        self.offset = offset
+        self.length = length
+        self.size = size
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "url": self.url,
+            "timestamp": self.timestamp,
+            "keyframe": self.base is None,
+            "stored_bytes": self.length,
+            "size": self.size,
+        }
+
+
+class PageSourceStore:
+    """
+    Append-only store of page source snapshots.
+
+    Every snapshot is saved as a zlib-compressed line delta against the
+    previous snapshot of the same URL (fragment ignored), with a full
+    keyframe every ``keyframe_interval`` snapshots of a URL or whenever the
+    delta would not be smaller. Records are streamed to ``path`` (a
+    temporary file by default, deleted by close()) and only a small index
+    stays in memory.
+    Snapshots are rebuilt lazily from their keyframe; rebuilt sources are
+    kept in an LRU cache bounded to ``cache_bytes`` characters.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        keyframe_interval: int = 20,
+        cache_bytes: int = 32 * 1024 * 1024,
+        level: int = 6,
+    ):
+        self._temporary = path is None
+        if path is None:
+            descriptor, path = tempfile.mkstemp(prefix="page-sources-", suffix=".bin")
+            os.close(descriptor)
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.cache_bytes = cache_bytes
+        self.level = level
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+        self._file = open(path, "a+b")
+        self._lock = threading.RLock()
+        self._snapshots = []
+        self._latest = {}
+        self._chain = {}
+        self._cache = OrderedDict()
+        self._cache_size = 0
+        self._load()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return len(self._snapshots)
+
+    def _load(self) -> None:
+        """
+        Rebuild the index of an existing store file
+        :return: None
+        """
+        self._file.seek(0)
+        while True:
+            offset = self._file.tell()
+            header = self._file.read(_LENGTH.size)
+            if len(header) < _LENGTH.size:
+                break
+            size = _LENGTH.unpack(header)[0]
+            meta = self._file.read(size)
+            if len(meta) < size:
+                break
+            header = self._file.read(_LENGTH.size)
+            if len(header) < _LENGTH.size:
+                break
+            length = _LENGTH.unpack(header)[0]
+            start = self._file.tell()
+            self._file.seek(length, os.SEEK_CUR)
+            if self._file.tell() - start < length:
+                break
+            url, timestamp, base, size = json.loads(meta)
+            self._index(url, timestamp, base, start, length, size)
+        self._file.seek(0, os.SEEK_END)
+        if self._file.tell() != offset:
+            # Drop a record truncated by a crash.
+            self._file.truncate(offset)
+
+    def _index(self, url, timestamp, base, offset, length, size) -> _Snapshot:
+        """
+        Add an index entry
+        :return: _Snapshot
+        """
+        snapshot = _Snapshot(
+            len(self._snapshots), url, timestamp, base, offset, length, size
+        )
+        self._snapshots.append(snapshot)
+        self._chain[url] = 1 if base is None else self._chain.get(url, 0) + 1
+        self._latest[url] = snapshot.id
+        self.raw_bytes += size
+        self.stored_bytes += length
+        return snapshot
+
+    def add(self, source: str, url: str, timestamp: Optional[float] = None) -> int:
+        """
+        Store a snapshot
+        :param source: page source
+        :param url: page URL, the fragment is ignored
+        :param timestamp: epoch seconds, now when omitted
+        :return: snapshot id
+        """
+        url = url.split("#", 1)[0]
+        if timestamp is None:
+            timestamp = time.time()
+        with self._lock:
+            lines = source.splitlines(keepends=True)
+            base = self._latest.get(url)
+            payload = None
+            if base is not None and self._chain[url] < self.keyframe_interval:
+                delta = _delta(self._lines(base), lines)
+                payload = zlib.compress(
+                    json.dumps(delta, separators=(",", ":")).encode(), self.level
+                )
+            full = zlib.compress(source.encode(), self.level)
+            if payload is None or len(payload) >= len(full):
+                payload, base = full, None
+            meta = json.dumps([url, timestamp, base, len(source)]).encode()
+            self._file.seek(0, os.SEEK_END)
+            self._file.write(
+                _LENGTH.pack(len(meta)) + meta + _LENGTH.pack(len(payload))
+            )
+            offset = self._file.tell()
+            self._file.write(payload)
+            self._file.flush()
+            snapshot = self._index(
+                url, timestamp, base, offset, len(payload), len(source)
+            )
+            self._remember(snapshot.id, source, lines)
+            return snapshot.id
+
+    def _read(self, snapshot: _Snapshot) -> bytes:
+        """
+        Read and decompress a record
+        :param snapshot: index entry
+        :return: bytes
+        """
+        self._file.seek(snapshot.offset)
+        return zlib.decompress(self._file.read(snapshot.length))
+
+    def _lines(self, snapshot_id: int) -> list:
+        """
+        Lines of a snapshot, rebuilt from its keyframe when not cached
+        :param snapshot_id: snapshot id
+        :return: list of lines
+        """
+        cached = self._cache.get(snapshot_id)
+        if cached is not None:
+            self._cache.move_to_end(snapshot_id)
+            return cached[1]
+        chain = []
+        current = self._snapshots[snapshot_id]
+        while current.id not in self._cache and current.base is not None:
+            chain.append(current)
+            current = self._snapshots[current.base]
+        if current.id in self._cache:
+            self._cache.move_to_end(current.id)
+            lines = self._cache[current.id][1]
+        else:
+            lines = self._read(current).decode().splitlines(keepends=True)
+            self._remember(current.id, None, lines)
+        for snapshot in reversed(chain):
+            lines = _apply(lines, json.loads(self._read(snapshot)))
+            self._remember(snapshot.id, None, lines)
+        return lines
+
+    def _remember(self, snapshot_id: int, source: Optional[str], lines: list) -> None:
+        """
+        Put rebuilt lines into the LRU cache
+        :return: None
+        """
+        if snapshot_id in self._cache:
+            self._cache.move_to_end(snapshot_id)
+            return
+        size = len(source) if source is not None else sum(map(len, lines))
+        self._cache[snapshot_id] = (size, lines)
+        self._cache_size += size
+        while self._cache_size > self.cache_bytes and len(self._cache) > 1:
+            _, (evicted, _) = self._cache.popitem(last=False)
+            self._cache_size -= evicted
+
+    def get(self, snapshot_id: int) -> str:
+        """
+        Page source of a snapshot
+        :param snapshot_id: id returned by add()
+        :return: str
+        """
+        with self._lock:
+            return "".join(self._lines(snapshot_id))
+
+    def latest(self, url: str) -> Optional[str]:
+        """
+        Page source of the newest snapshot of a URL
+        :param url: page URL
+        :return: str, or None when the URL has no snapshot
+        """
+        with self._lock:
+            snapshot_id = self._latest.get(url.split("#", 1)[0])
+            return None if snapshot_id is None else self.get(snapshot_id)
+
+    def snapshots(self, url: Optional[str] = None) -> List[dict]:
+        """
+        Index of the stored snapshots
+        :param url: only snapshots of this URL
+        :return: list of dicts with id, url, timestamp, keyframe, sizes
+        """
+        with self._lock:
+            if url is not None:
+                url = url.split("#", 1)[0]
+            return [
+                snapshot.as_dict()
+                for snapshot in self._snapshots
+                if url is None or snapshot.url == url
+            ]
+
+    def stats(self) -> dict:
+        """
+        Size counters
+        :return: dict
+        """
+        with self._lock:
+            return {
+                "snapshots": len(self._snapshots),
+                "urls": len(self._latest),
+                "raw_bytes": self.raw_bytes,
+                "stored_bytes": self.stored_bytes,
+                "ratio": self.raw_bytes / self.stored_bytes
+                if self.stored_bytes
+                else 0.0,
+                "cache_bytes": self._cache_size,
+            }
+
+    def close(self) -> None:
+        """
+        Close the store file, deleting it when the store created it
+        :return: None
+        """
+        with self._lock:
+            self._cache.clear()
+            self._cache_size = 0
+            self._file.close()
+            if self._temporary:
+                self._temporary = False
+                try:
+                    os.unlink(self.path)
+                except FileNotFoundError:
+                    pass
+
+
+def _delta(old: list, new: list) -> list:
+    """
+    Line delta turning old into new
+    :param old: lines of the base snapshot
+    :param new: lines of the new snapshot
+    :return: [[start, end] to copy from old, or [lines] to insert, ...]
+    """
+    operations = []
+    matcher = difflib.SequenceMatcher(None, old, new)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            operations.append([i1, i2])
+        elif j2 > j1:
+            operations.append(["".join(new[j1:j2])])
+    return operations
+
+
+def _apply(old: list, delta: list) -> list:
+    """
+    Rebuild the lines of a snapshot from its base and delta
+    :param old: lines of the base snapshot
+    :param delta: output of _delta
+    :return: list of lines
+    """
+    lines = []
+    for operation in delta:
+        if len(operation) == 2:
+            lines.extend(old[operation[0] : operation[1]])
+        else:
+            lines.extend(operation[0].splitlines(keepends=True))
+    return lines
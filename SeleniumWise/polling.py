@@ -0,0 +1,171 @@
+"""
+The Module holds the polling strategies used by the ElementOperations waits.
+"""
+import time
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+DEFAULT_IGNORED_EXCEPTIONS = (NoSuchElementException,)
+
+
+class Polling:
+    """
+    Base class of the polling strategies: a source of sleep intervals.
+    """
+
+    def intervals(self) -> Iterator[float]:
+        """
+        Successive sleep intervals of one wait
+        :return: iterator of seconds
+        """
+        raise NotImplementedError
+
+
+def _positive(name: str, value: float) -> float:
+    """
+    Reject intervals that would make a wait hammer the driver
+    :param name: argument name
+    :param value: seconds
+    :return: value
+    """
+    if value <= 0:
+        raise ValueError(f"{name} must be positive, got {value}")
+    return value
+
+
+class FixedPolling(Polling):
+    """
+    Sleep the same interval between every check, like WebDriverWait.
+    """
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = _positive("interval", interval)
+
+    def __repr__(self):
+        return f"FixedPolling({self.interval})"
+
+    def intervals(self) -> Iterator[float]:
+        while True:
+            yield self.interval
+
+
+class ExponentialPolling(Polling):
+    """
+    Start with a short interval and multiply it after every check, up to a cap.
+    """
+
+    def __init__(self, initial: float = 0.02, factor: float = 2.0, cap: float = 1.0):
+        self.initial = _positive("initial", initial)
+        self.factor = factor
+        self.cap = _positive("cap", cap)
+
+    def __repr__(self):
+        return f"ExponentialPolling({self.initial}, {self.factor}, {self.cap})"
+
+    def intervals(self) -> Iterator[float]:
+        interval = self.initial
+        while True:
+            yield interval
+            interval = min(interval * self.factor, self.cap)
+
+
+class FastThenSlowPolling(Polling):
+    """
+    Poll at fast_interval for the first fast_duration seconds, then slowly.
+    """
+
+    def __init__(
+        self,
+        fast_interval: float = 0.05,
+        fast_duration: float = 1.0,
+        slow_interval: float = 0.5,
+    ):
+        self.fast_interval = _positive("fast_interval", fast_interval)
+        self.fast_duration = fast_duration
+        self.slow_interval = _positive("slow_interval", slow_interval)
+
+    def __repr__(self):
+        return (
+            f"FastThenSlowPolling({self.fast_interval}, "
+            f"{self.fast_duration}, {self.slow_interval})"
+        )
+
+    def intervals(self) -> Iterator[float]:
+        started = time.monotonic()
+        while time.monotonic() - started < self.fast_duration:
+            yield self.fast_interval
+        while True:
+            yield self.slow_interval
+
+
+def as_polling(polling: Union[Polling, float, None]) -> Polling:
+    """
+    Normalise a polling argument
+    :param polling: strategy, a fixed interval in seconds, or None for 0.5 s;
+        an interval of 0 also means 0.5 s, as in WebDriverWait
+    :return: Polling
+    """
+    if polling is None or (not isinstance(polling, Polling) and polling == 0):
+        return FixedPolling()
+    if isinstance(polling, Polling):
+        return polling
+    return FixedPolling(float(polling))
+
+
+def ignored(ignored_exceptions: Optional[Iterable[type]] = None) -> tuple:
+    """
+    Exceptions a wait treats as "not yet": the defaults plus the given ones,
+    as WebDriverWait does
+    :param ignored_exceptions: extra exceptions
+    :return: tuple of exception types
+    """
+    extra = tuple(ignored_exceptions or ())
+    return DEFAULT_IGNORED_EXCEPTIONS + tuple(
+        exception for exception in extra if exception not in DEFAULT_IGNORED_EXCEPTIONS
+    )
+
+
+def wait_until(
+    driver,
+    condition: Callable,
+    timeout: float,
+    polling: Union[Polling, float, None] = None,
+    ignored_exceptions: Optional[Iterable[type]] = None,
+    message: str = "",
+    on_poll: Optional[Callable[[], None]] = None,
+):
+    """
+    Call condition(driver) until it returns a truthy value, like
+    WebDriverWait.until but sleeping according to a polling strategy
+    :param driver: WebDriver
+    :param condition: callable taking the driver
+    :param timeout: maximum time to wait in seconds
+    :param polling: polling strategy or fixed interval
+    :param ignored_exceptions: exceptions treated as "not yet" besides
+        NoSuchElementException
+    :param message: TimeoutException message
+    :param on_poll: called after every evaluation of the condition
+    :return: the condition's value
+    """
+    ignored_exceptions = ignored(ignored_exceptions)
+    intervals = as_polling(polling).intervals()
+    screen = None
+    stacktrace = None
+    end_time = time.monotonic() + timeout
+    while True:
+        try:
+            value = condition(driver)
+            if value:
+                return value
+        except ignored_exceptions as exc:
+            screen = getattr(exc, "screen", None)
+            stacktrace = getattr(exc, "stacktrace", None)
+        finally:
+            if on_poll is not None:
+                on_poll()
+        remaining = end_time - time.monotonic()
+        if remaining <= 0:
+            break
+        time.sleep(min(next(intervals), remaining))
+    raise TimeoutException(message, screen, stacktrace)
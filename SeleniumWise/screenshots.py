@@ -0,0 +1,206 @@
+"""
+The Module writes screenshots to disk on background threads.
+"""
+import base64
+import hashlib
+import logging
+import os
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from selenium.webdriver.remote.webelement import WebElement
+
+_STOP = object()
+
+
+class ScreenshotPipeline:
+    """
+    Asynchronous screenshot writer.
+
+    capture() only fetches the base64 PNG from the driver on the calling
+    thread, which has to happen at that moment, and returns a Future. A
+    dispatcher thread decodes and hashes the image and drops it when it is
+    identical to the previous capture of the same target; a pool of
+    ``workers`` threads writes the rest to disk. At most ``max_queue``
+    captures wait for the dispatcher; capture() blocks when the queue is full
+    so a slow disk cannot grow memory without bound. The previous capture
+    is remembered for the ``max_targets`` most recently captured targets;
+    element ids change whenever the page re-renders, so older ones are
+    forgotten.
+
+    Element captures use the WebDriver element screenshot command, which
+    crops in the browser instead of transferring the full page.
+    """
+
+    def __init__(
+        self, driver, workers: int = 2, max_queue: int = 32, max_targets: int = 256
+    ):
+        self.driver = driver
+        self.captured = 0
+        self.written = 0
+        self.skipped = 0
+        self.failed = 0
+        self.bytes_written = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._max_writes = max_queue
+        self._writes = threading.BoundedSemaphore(max_queue)
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="Screenshot-write")
+        self._max_targets = max_targets
+        self._last = OrderedDict()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._dispatcher = threading.Thread(
+            target=self._dispatch, name="Screenshot-dispatch", daemon=True
+        )
+        self._dispatcher.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def capture(self, filename: str, element: Optional[WebElement] = None) -> Future:
+        """
+        Take a screenshot now and write it in the background
+        :param filename: PNG path, parent directories are created
+        :param element: only capture this element
+        :return: Future resolving to the path written, or to the path of the
+            identical previous capture when this one was skipped
+        """
+        if self._closed:
+            raise RuntimeError("ScreenshotPipeline is closed")
+        if element is None:
+            data, target = self.driver.get_screenshot_as_base64(), None
+        else:
+            data, target = element.screenshot_as_base64, element.id
+        future = Future()
+        self._queue.put((data, target, filename, future))
+        with self._lock:
+            self.captured += 1
+        return future
+
+    def _dispatch(self) -> None:
+        """
+        Dispatcher thread body: decode, deduplicate and hand off writes
+        :return: None
+        """
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                data, target, filename, future = item
+                try:
+                    png = base64.b64decode(data)
+                except Exception as error:
+                    self._fail(future, error)
+                    continue
+                digest = hashlib.blake2b(png, digest_size=16).digest()
+                previous = self._last.get(target)
+                if (
+                    previous is not None
+                    and previous[0] == digest
+                    and not (previous[1].done() and previous[1].exception())
+                ):
+                    with self._lock:
+                        self.skipped += 1
+                    self._last.move_to_end(target)
+                    previous[1].add_done_callback(
+                        lambda done, future=future: _chain(done, future)
+                    )
+                    continue
+                self._last[target] = (digest, future)
+                self._last.move_to_end(target)
+                while len(self._last) > self._max_targets:
+                    self._last.popitem(last=False)
+                self._writes.acquire()
+                self._pool.submit(self._write, png, filename, future)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, png: bytes, filename: str, future: Future) -> None:
+        """
+        Worker body: write one PNG
+        :return: None
+        """
+        try:
+            directory = os.path.dirname(filename)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(filename, "wb") as file:
+                file.write(png)
+            with self._lock:
+                self.written += 1
+                self.bytes_written += len(png)
+            future.set_result(filename)
+        except Exception as error:
+            self._fail(future, error)
+        finally:
+            self._writes.release()
+
+    def _fail(self, future: Future, error: Exception) -> None:
+        """
+        Record a failed capture
+        :return: None
+        """
+        logging.error(f"Operation Failed: {error}")
+        with self._lock:
+            self.failed += 1
+        future.set_exception(error)
+
+    def flush(self) -> None:
+        """
+        Block until every queued capture is written or skipped
+        :return: None
+        """
+        self._queue.join()
+        for _ in range(self._max_writes):
+            self._writes.acquire()
+        for _ in range(self._max_writes):
+            self._writes.release()
+
+    def close(self) -> None:
+        """
+        Flush and stop the background threads
+        :return: None
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._dispatcher.join()
+        self._pool.shutdown(wait=True)
+        self._last.clear()
+
+    def stats(self) -> dict:
+        """
+        Capture counters
+        :return: dict
+        """
+        with self._lock:
+            return {
+                "captured": self.captured,
+                "written": self.written,
+                "skipped": self.skipped,
+                "failed": self.failed,
+                "bytes_written": self.bytes_written,
+                "queued": self._queue.qsize(),
+            }
+
+
+def _chain(source: Future, target: Future) -> None:
+    """
+    Resolve a skipped capture's Future like the one it duplicates
+    :param source: Future of the identical previous capture
+    :param target: Future of the skipped capture
+    :return: None
+    """
+    error = source.exception()
+    if error is not None:
+        target.set_exception(error)
+    else:
+        target.set_result(source.result())
@@ -0,0 +1,599 @@
+"""
+The Module holds the JavaScript snippets shared by the SeleniumWise classes.
+"""
+import pkgutil
+from typing import Sequence
+
+_ATOMS_PACKAGE = "selenium.webdriver.remote"
+
+# Defines findAll(root, using, value): resolves a Selenium (By, value) pair
+# inside the page and returns an array of elements. id, name and class name
+# are mapped to CSS the same way the W3C remote end does it.
+FIND_FUNCTION = """
+function cssString(value) {
+    return '"' + String(value).replace(/["\\\\]/g, '\\\\$&') + '"';
+}
+function findAll(root, using, value) {
+    var doc = root.ownerDocument || root;
+    switch (using) {
+        case 'css selector':
+            return Array.prototype.slice.call(root.querySelectorAll(value));
+        case 'id':
+            return Array.prototype.slice.call(
+                root.querySelectorAll('[id=' + cssString(value) + ']'));
+        case 'name':
+            return Array.prototype.slice.call(
+                root.querySelectorAll('[name=' + cssString(value) + ']'));
+        case 'class name':
+            return Array.prototype.slice.call(
+                root.querySelectorAll('.' + CSS.escape(value)));
+        case 'tag name':
+            return Array.prototype.slice.call(root.querySelectorAll(value));
+        case 'xpath':
+            var snapshot = doc.evaluate(
+                value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < snapshot.snapshotLength; i++) {
+                nodes.push(snapshot.snapshotItem(i));
+            }
+            return nodes;
+        case 'link text':
+        case 'partial link text':
+            var links = Array.prototype.slice.call(root.querySelectorAll('a'));
+            return links.filter(function (link) {
+                var text = (link.innerText || link.textContent || '').trim();
+                return using === 'link text'
+                    ? text === value : text.indexOf(value) !== -1;
+            });
+    }
+    throw new Error('Unsupported locator strategy: ' + using);
+}
+"""
+
+# arguments: [[using, value], ...], all
+FIND_MANY_SCRIPT = (
+    FIND_FUNCTION
+    + """
+var locators = arguments[0], all = arguments[1];
+return locators.map(function (locator) {
+    var found = findAll(document, locator[0], locator[1]);
+    return all ? found : (found.length ? found[0] : null);
+});
+"""
+)
+
+# Selenium's getAttribute and isDisplayed atoms, the scripts
+# WebElement.get_attribute and WebElement.is_displayed run, as JavaScript
+# function expressions. They are loaded the same way WebElement loads them.
+GET_ATTRIBUTE_ATOM = pkgutil.get_data(_ATOMS_PACKAGE, "getAttribute.js").decode("utf8")
+IS_DISPLAYED_ATOM = pkgutil.get_data(_ATOMS_PACKAGE, "isDisplayed.js").decode("utf8")
+
+
+def with_atoms(script: str, attribute: bool = False, displayed: bool = False) -> str:
+    """
+    Prepend the Selenium atoms a script calls. readFields and the wait
+    script call seleniumAttribute and isDisplayed only for the fields and
+    conditions that need them, so the atoms (about 45 kB each) are only
+    sent when used
+    :param script: script using READ_FIELDS_FUNCTION
+    :param attribute: define seleniumAttribute(element, name)
+    :param displayed: define isDisplayed(element)
+    :return: script
+    """
+    if attribute:
+        script = f"var seleniumAttribute = {GET_ATTRIBUTE_ATOM};\n" + script
+    if displayed:
+        script = f"var isDisplayed = {IS_DISPLAYED_ATOM};\n" + script
+    return script
+
+
+def fields_script(script: str, fields: Sequence[str]) -> str:
+    """
+    A readFields script with the Selenium atoms the fields need
+    :param script: script using READ_FIELDS_FUNCTION
+    :param fields: readFields field names
+    :return: script
+    """
+    return with_atoms(
+        script,
+        attribute=any(field.startswith("attribute:") for field in fields),
+        displayed="displayed" in fields,
+    )
+
+
+# Defines readFields(element, fields): reads the requested fields of one
+# element. Fields are text, tag_name, rect, location, size, displayed,
+# enabled, selected, attribute:<name>, dom_attribute:<name>, property:<name>
+# and css:<name>. attribute and displayed run Selenium's own atoms, which
+# fields_script() prepends; location is rounded and size is not, as with
+# WebElement. As with WebElement.text, text is empty for elements that are
+# not rendered, and colors are reported as rgba() like
+# WebElement.value_of_css_property.
+READ_FIELDS_FUNCTION = """
+var COLOR_PROPERTIES = ['background-color', 'border-top-color',
+    'border-right-color', 'border-bottom-color', 'border-left-color', 'color',
+    'outline-color'];
+function isRendered(element) {
+    if (!element.isConnected) {
+        return false;
+    }
+    for (var node = element; node && node.nodeType === 1; node = node.parentNode) {
+        var style = window.getComputedStyle(node);
+        if (style.display === 'none') {
+            return false;
+        }
+    }
+    var own = window.getComputedStyle(element);
+    return own.visibility !== 'hidden' && own.visibility !== 'collapse';
+}
+function cssValue(element, name) {
+    var value = window.getComputedStyle(element).getPropertyValue(name);
+    if (COLOR_PROPERTIES.indexOf(name.toLowerCase()) !== -1) {
+        var rgb = /^rgb\\((\\d+), (\\d+), (\\d+)\\)$/.exec(value);
+        if (rgb) {
+            return 'rgba(' + rgb[1] + ', ' + rgb[2] + ', ' + rgb[3] + ', 1)';
+        }
+    }
+    return value;
+}
+function readFields(element, fields) {
+    var record = {};
+    var box = null;
+    function rect() {
+        if (box === null) {
+            var client = element.getBoundingClientRect();
+            box = {x: client.left + window.pageXOffset,
+                   y: client.top + window.pageYOffset,
+                   width: client.width, height: client.height};
+        }
+        return box;
+    }
+    fields.forEach(function (field) {
+        var split = field.indexOf(':');
+        var kind = split === -1 ? field : field.slice(0, split);
+        var name = split === -1 ? null : field.slice(split + 1);
+        switch (kind) {
+            case 'text':
+                record[field] = isRendered(element)
+                    ? (element.innerText || '').trim() : '';
+                break;
+            case 'tag_name':
+                record[field] = element.tagName.toLowerCase(); break;
+            case 'rect':
+                record[field] = rect(); break;
+            case 'location':
+                record[field] = {x: Math.round(rect().x), y: Math.round(rect().y)};
+                break;
+            case 'size':
+                record[field] = {width: rect().width, height: rect().height};
+                break;
+            case 'displayed':
+                record[field] = isDisplayed(element); break;
+            case 'enabled':
+                record[field] = !element.matches(':disabled'); break;
+            case 'selected':
+                record[field] = !!(element.checked || element.selected); break;
+            case 'attribute':
+                record[field] = seleniumAttribute(element, name); break;
+            case 'dom_attribute':
+                record[field] = element.getAttribute(name); break;
+            case 'property':
+                record[field] = element[name] === undefined ? null : element[name];
+                break;
+            case 'css':
+                record[field] = cssValue(element, name); break;
+            default:
+                throw new Error('Unsupported snapshot field: ' + field);
+        }
+    });
+    return record;
+}
+"""
+
+# arguments: elements or null, [using, value] or null, fields
+SNAPSHOT_SCRIPT = (
+    FIND_FUNCTION
+    + READ_FIELDS_FUNCTION
+    + """
+var elements = arguments[0], locator = arguments[1], fields = arguments[2];
+if (locator) {
+    elements = findAll(document, locator[0], locator[1]);
+}
+return elements.map(function (element) {
+    return readFields(element, fields);
+});
+"""
+)
+
+# arguments: [[condition, using, value, text], ...], mode ("any" or "all"),
+# timeout in milliseconds, callback. Re-checks the conditions on every DOM
+# mutation and animation frame and calls back with {index, value} (any),
+# {values} (all) or {timeout: true}.
+WAIT_SCRIPT = (
+    FIND_FUNCTION
+    + READ_FIELDS_FUNCTION
+    + """
+var conditions = arguments[0], mode = arguments[1], timeout = arguments[2];
+var callback = arguments[arguments.length - 1];
+function first(condition) {
+    var found = findAll(document, condition[1], condition[2]);
+    return found.length ? found[0] : null;
+}
+function evaluate(condition) {
+    var element = first(condition);
+    switch (condition[0]) {
+        case 'present':
+            return element;
+        case 'visible':
+            return element && isDisplayed(element) ? element : null;
+        case 'clickable':
+            return element && isDisplayed(element)
+                && !element.matches(':disabled') ? element : null;
+        case 'text':
+            return !!element
+                && (element.innerText || '').indexOf(condition[3]) !== -1;
+        case 'value':
+            return !!element
+                && String(element.value || '').indexOf(condition[3]) !== -1;
+        case 'invisible':
+            return !element || !isDisplayed(element);
+    }
+    throw new Error('Unsupported wait condition: ' + condition[0]);
+}
+var finished = false, observer = null, frame = null, timer = null, fallback = null;
+function finish(result) {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    if (observer) { observer.disconnect(); }
+    if (frame !== null) { window.cancelAnimationFrame(frame); }
+    clearTimeout(timer);
+    clearInterval(fallback);
+    callback(result);
+}
+function check() {
+    if (finished) {
+        return;
+    }
+    try {
+        var values = conditions.map(evaluate);
+    } catch (error) {
+        finish({error: String(error)});
+        return;
+    }
+    if (mode === 'all') {
+        if (values.every(function (value) { return !!value; })) {
+            finish({values: values});
+        }
+        return;
+    }
+    for (var i = 0; i < values.length; i++) {
+        if (values[i]) {
+            finish({index: i, value: values[i]});
+            return;
+        }
+    }
+}
+function onFrame() {
+    check();
+    if (!finished) {
+        frame = window.requestAnimationFrame(onFrame);
+    }
+}
+check();
+if (!finished) {
+    observer = new MutationObserver(check);
+    observer.observe(document, {childList: true, subtree: true,
+                                attributes: true, characterData: true});
+    frame = window.requestAnimationFrame(onFrame);
+    // Animation frames are paused in background tabs.
+    fallback = setInterval(check, 100);
+    timer = setTimeout(function () { finish({timeout: true}); }, timeout);
+}
+"""
+)
+
+# arguments: element. Returns what the locator profiler needs to build
+# narrower locators for it: own id, name, tag, classes and the id of the
+# nearest ancestor that has one.
+ELEMENT_IDENTITY_SCRIPT = """
+var element = arguments[0];
+var ancestor = element.parentElement;
+while (ancestor && !ancestor.id) {
+    ancestor = ancestor.parentElement;
+}
+return {
+    id: element.id || null,
+    name: element.getAttribute('name'),
+    tag: element.tagName.toLowerCase(),
+    classes: Array.prototype.slice.call(element.classList),
+    ancestor: ancestor ? ancestor.id : null
+};
+"""
+
+# arguments: [[using, value, field value, type], ...]. Sets each field the
+# way a user would leave it: text through the native value setter (so React
+# and Vue see the change) followed by input and change events, selects by
+# option value or text, checkboxes and radios by clicking when their state
+# differs. Fields with type set are only located and returned for send_keys.
+# Returns one [status, element] pair per field, status true or an error.
+FILL_FORM_SCRIPT = (
+    FIND_FUNCTION
+    + """
+var fields = arguments[0];
+function fire(element, type) {
+    element.dispatchEvent(new Event(type, {bubbles: true}));
+}
+function setValue(element, value) {
+    var prototype = Object.getPrototypeOf(element);
+    var descriptor = Object.getOwnPropertyDescriptor(prototype, 'value');
+    if (descriptor && descriptor.set) {
+        descriptor.set.call(element, value);
+    } else {
+        element.value = value;
+    }
+}
+function selectOptions(element, value) {
+    var wanted = Array.isArray(value) ? value.map(String) : [String(value)];
+    var matched = 0;
+    Array.prototype.forEach.call(element.options, function (option) {
+        var text = option.text.trim();
+        var hit = wanted.indexOf(option.value) !== -1 || wanted.indexOf(text) !== -1;
+        if (hit) {
+            matched++;
+        }
+        if (element.multiple) {
+            option.selected = hit;
+        } else if (hit && matched === 1) {
+            setValue(element, option.value);
+        }
+    });
+    if (!matched) {
+        return 'No option matching ' + wanted.join(', ');
+    }
+    fire(element, 'input');
+    fire(element, 'change');
+    return true;
+}
+function fill(elements, value) {
+    var element = elements[0];
+    var tag = element.tagName.toLowerCase();
+    var type = (element.getAttribute('type') || '').toLowerCase();
+    if (tag === 'select') {
+        return selectOptions(element, value);
+    }
+    if (tag === 'input' && type === 'radio' && typeof value !== 'boolean') {
+        var radio = elements.filter(function (candidate) {
+            return candidate.value === String(value);
+        })[0];
+        if (!radio) {
+            return 'No radio with value ' + value;
+        }
+        if (!radio.checked) {
+            radio.click();
+        }
+        return true;
+    }
+    if (tag === 'input' && (type === 'checkbox' || type === 'radio')) {
+        if (element.checked !== !!value) {
+            element.click();
+        }
+        return true;
+    }
+    if (element.isContentEditable) {
+        element.textContent = String(value);
+        fire(element, 'input');
+        return true;
+    }
+    setValue(element, String(value));
+    fire(element, 'input');
+    fire(element, 'change');
+    return true;
+}
+return fields.map(function (field) {
+    var elements = findAll(document, field[0], field[1]);
+    if (!elements.length) {
+        return ['No element found for ' + field[0] + '=' + field[1], null];
+    }
+    if (field[3]) {
+        return [true, elements[0]];
+    }
+    try {
+        return [fill(elements, field[2]), null];
+    } catch (error) {
+        return [String(error), null];
+    }
+});
+"""
+)
+
+# Defines scrollToElement(element, options): with null options the legacy
+# scrollIntoView(); otherwise scrolls only when the element is not fully
+# inside the viewport and every clipping ancestor, aligned with
+# options.block/options.inline and without smooth scrolling. Returns whether
+# it scrolled.
+SCROLL_FUNCTION = """
+function isInView(element) {
+    var box = element.getBoundingClientRect();
+    if (box.width === 0 && box.height === 0) {
+        return false;
+    }
+    var root = document.documentElement;
+    if (box.top < 0 || box.left < 0
+            || box.bottom > (window.innerHeight || root.clientHeight)
+            || box.right > (window.innerWidth || root.clientWidth)) {
+        return false;
+    }
+    for (var node = element.parentElement; node && node !== document.body
+            && node !== root; node = node.parentElement) {
+        var style = window.getComputedStyle(node);
+        if (style.overflowX === 'visible' && style.overflowY === 'visible') {
+            continue;
+        }
+        var clip = node.getBoundingClientRect();
+        if (box.top < clip.top || box.left < clip.left
+                || box.bottom > clip.bottom || box.right > clip.right) {
+            return false;
+        }
+    }
+    return true;
+}
+function scrollToElement(element, options) {
+    if (!options) {
+        element.scrollIntoView();
+        return true;
+    }
+    if (isInView(element)) {
+        return false;
+    }
+    element.scrollIntoView({block: options.block, inline: options.inline,
+                            behavior: 'instant'});
+    return true;
+}
+"""
+
+# arguments: element, scroll options
+SCROLL_SCRIPT = (
+    SCROLL_FUNCTION
+    + """
+return scrollToElement(arguments[0], arguments[1]);
+"""
+)
+
+# arguments: element, fields, scroll options. Scrolls the element into view
+# and reads the fields (see readFields) in the same call.
+SCROLL_SNAPSHOT_SCRIPT = (
+    SCROLL_FUNCTION
+    + READ_FIELDS_FUNCTION
+    + """
+var element = arguments[0];
+scrollToElement(element, arguments[2]);
+return readFields(element, arguments[1]);
+"""
+)
+
+# Returns {origin, local, session} with the web storage of the current
+# document, or null where storage is not accessible (opaque origins).
+STORAGE_READ_SCRIPT = """
+function dump(storage) {
+    var items = {};
+    for (var i = 0; i < storage.length; i++) {
+        var key = storage.key(i);
+        items[key] = storage.getItem(key);
+    }
+    return items;
+}
+try {
+    return {origin: window.location.origin, local: dump(window.localStorage),
+            session: dump(window.sessionStorage)};
+} catch (error) {
+    return null;
+}
+"""
+
+# arguments: local items, session items, clear first. Returns the origin.
+STORAGE_WRITE_SCRIPT = """
+var local = arguments[0], session = arguments[1], clear = arguments[2];
+if (clear) {
+    window.localStorage.clear();
+    window.sessionStorage.clear();
+}
+Object.keys(local).forEach(function (key) {
+    window.localStorage.setItem(key, local[key]);
+});
+Object.keys(session).forEach(function (key) {
+    window.sessionStorage.setItem(key, session[key]);
+});
+return window.location.origin;
+"""
+
+# arguments: maximum milliseconds to wait for the load event, callback.
+# Reports the PerformanceNavigationTiming entry, paint timings (LCP through
+# a buffered PerformanceObserver) and resource counts of the document, all
+# in milliseconds since navigation start.
+NAVIGATION_TIMING_SCRIPT = """
+var maxWait = arguments[0], callback = arguments[arguments.length - 1];
+function navigation() {
+    var entries = performance.getEntriesByType('navigation');
+    return entries.length ? entries[0] : null;
+}
+function report(lcp) {
+    var nav = navigation();
+    var paint = {};
+    performance.getEntriesByType('paint').forEach(function (entry) {
+        paint[entry.name] = entry.startTime;
+    });
+    var resources = performance.getEntriesByType('resource');
+    var byType = {}, transfer = 0;
+    resources.forEach(function (entry) {
+        byType[entry.initiatorType] = (byType[entry.initiatorType] || 0) + 1;
+        transfer += entry.transferSize || 0;
+    });
+    callback({
+        url: window.location.href,
+        navigation: nav ? {
+            type: nav.type,
+            redirect_count: nav.redirectCount,
+            dns: nav.domainLookupEnd - nav.domainLookupStart,
+            connect: nav.connectEnd - nav.connectStart,
+            ttfb: nav.responseStart - nav.startTime,
+            response_end: nav.responseEnd - nav.startTime,
+            dom_interactive: nav.domInteractive - nav.startTime,
+            dom_content_loaded: nav.domContentLoadedEventEnd - nav.startTime,
+            load: nav.loadEventEnd ? nav.loadEventEnd - nav.startTime : null,
+            transfer_size: nav.transferSize,
+            encoded_body_size: nav.encodedBodySize,
+            decoded_body_size: nav.decodedBodySize
+        } : null,
+        first_paint: paint['first-paint'] === undefined ? null : paint['first-paint'],
+        first_contentful_paint: paint['first-contentful-paint'] === undefined
+            ? null : paint['first-contentful-paint'],
+        largest_contentful_paint: lcp,
+        resource_count: resources.length,
+        resource_transfer_size: transfer,
+        resources_by_type: byType
+    });
+}
+function collect() {
+    var types = (window.PerformanceObserver
+        && PerformanceObserver.supportedEntryTypes) || [];
+    if (types.indexOf('largest-contentful-paint') === -1) {
+        report(null);
+        return;
+    }
+    var lcp = null;
+    var observer = new PerformanceObserver(function (list) {
+        var entries = list.getEntries();
+        if (entries.length) {
+            var last = entries[entries.length - 1];
+            lcp = last.renderTime || last.loadTime || last.startTime;
+        }
+    });
+    observer.observe({type: 'largest-contentful-paint', buffered: true});
+    // Buffered entries are delivered asynchronously.
+    setTimeout(function () {
+        var pending = observer.takeRecords();
+        if (pending.length) {
+            var last = pending[pending.length - 1];
+            lcp = last.renderTime || last.loadTime || last.startTime;
+        }
+        observer.disconnect();
+        report(lcp);
+    }, 0);
+}
+var nav = navigation();
+if (!nav || nav.loadEventEnd) {
+    collect();
+} else {
+    var done = false;
+    var finish = function () {
+        if (!done) {
+            done = true;
+            setTimeout(collect, 0);
+        }
+    };
+    window.addEventListener('load', finish);
+    setTimeout(finish, maxWait);
+}
+"""
@@ -0,0 +1,338 @@
+"""
+The Module saves and restores authenticated browser state: cookies plus
+localStorage and sessionStorage.
+"""
+import json
+import os
+import re
+import tempfile
+import time
+from typing import Callable, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from SeleniumWise.scripts import STORAGE_READ_SCRIPT, STORAGE_WRITE_SCRIPT
+
+VERSION = 1
+
+# Cookie fields understood by both WebDriver add_cookie and CDP setCookies.
+_COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite")
+
+
+def _has_cdp(driver) -> bool:
+    """
+    Whether the driver speaks the Chrome DevTools Protocol
+    :param driver: WebDriver
+    :return: bool
+    """
+    return callable(getattr(driver, "execute_cdp_cmd", None))
+
+
+def _from_cdp(cookie: dict) -> dict:
+    """
+    WebDriver-style cookie from a CDP Network.Cookie
+    :param cookie: CDP cookie
+    :return: dict with "expiry" in epoch seconds for persistent cookies
+    """
+    result = {field: cookie[field] for field in _COOKIE_FIELDS if field in cookie}
+    if not cookie.get("session") and cookie.get("expires", -1) > 0:
+        result["expiry"] = int(cookie["expires"])
+    return result
+
+
+def _to_cdp(cookie: dict) -> dict:
+    """
+    CDP Network.CookieParam from a WebDriver-style cookie
+    :param cookie: cookie dict
+    :return: dict
+    """
+    result = {field: cookie[field] for field in _COOKIE_FIELDS if field in cookie}
+    if "expiry" in cookie:
+        result["expires"] = cookie["expiry"]
+    return result
+
+
+def _matches(domain: str, domains: Optional[Iterable[str]]) -> bool:
+    """
+    Whether a cookie domain belongs to one of the given domains
+    :param domain: cookie domain, possibly with a leading dot
+    :param domains: domains to keep, all when None
+    :return: bool
+    """
+    if domains is None:
+        return True
+    domain = domain.lstrip(".")
+    return any(
+        domain == wanted.lstrip(".") or domain.endswith("." + wanted.lstrip("."))
+        for wanted in domains
+    )
+
+
+def _read_storage(driver, storage: dict) -> None:
+    """
+    Add the web storage of the current document to a storage dict
+    :param driver: WebDriver
+    :param storage: {origin: {"local": {...}, "session": {...}}}
+    :return: None
+    """
+    dump = driver.execute_script(STORAGE_READ_SCRIPT)
+    if dump and dump["origin"] not in (None, "null"):
+        storage[dump["origin"]] = {"local": dump["local"], "session": dump["session"]}
+
+
+def _origin(url: str) -> str:
+    """
+    Origin of a URL
+    :param url: URL or origin
+    :return: scheme://host[:port]
+    """
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def capture_session(
+    driver, domains: Optional[Iterable[str]] = None, origins: Iterable[str] = ()
+) -> dict:
+    """
+    Read the cookies and the web storage of the current origin and of the
+    given origins
+    With CDP every cookie of the browser is read in one command, httpOnly
+    and other domains included; otherwise only the current domain's. Web
+    storage can only be read from a page of its origin, so each of
+    ``origins`` not open is visited, and the browser returns to the current
+    URL afterwards. The state's "storage" holds one entry per origin read.
+    :param driver: WebDriver
+    :param domains: only keep cookies of these domains and their subdomains
+    :param origins: other origins whose storage the login depends on, e.g.
+        the identity provider or API origins of an SSO login
+    :Example: capture_session(driver, origins=["https://login.example.com"])
+    :return: session state dict
+    """
+    if _has_cdp(driver):
+        raw = driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+        cookies = [_from_cdp(cookie) for cookie in raw]
+    else:
+        cookies = driver.get_cookies()
+    domains = list(domains) if domains is not None else None
+    cookies = [
+        cookie for cookie in cookies if _matches(cookie.get("domain", ""), domains)
+    ]
+    storage = {}
+    _read_storage(driver, storage)
+    missing = [origin for origin in map(_origin, origins) if origin not in storage]
+    if missing:
+        start = driver.current_url
+        for origin in missing:
+            _visit(driver, origin)
+            _read_storage(driver, storage)
+        driver.get(start)
+    return {
+        "version": VERSION,
+        "saved_at": time.time(),
+        "cookies": cookies,
+        "storage": storage,
+    }
+
+
+def session_problems(
+    state: dict,
+    max_age: Optional[float] = None,
+    required_cookies: Iterable[str] = (),
+    now: Optional[float] = None,
+) -> List[str]:
+    """
+    Reasons why a saved state should not be restored
+    :param state: session state dict
+    :param max_age: maximum age of the state in seconds
+    :param required_cookies: cookie names that must be present and unexpired
+    :param now: epoch seconds, current time when omitted
+    :return: list of problems, empty when the state is usable
+    """
+    now = time.time() if now is None else now
+    problems = []
+    if state.get("version") != VERSION:
+        problems.append(f"unsupported version {state.get('version')}")
+    if max_age is not None and now - state.get("saved_at", 0) > max_age:
+        problems.append(f"older than {max_age}s")
+    alive = {
+        cookie["name"]
+        for cookie in state.get("cookies", ())
+        if cookie.get("expiry") is None or cookie["expiry"] > now
+    }
+    for name in required_cookies:
+        if name not in alive:
+            problems.append(f"cookie {name} missing or expired")
+    return problems
+
+
+def apply_session(driver, state: dict, clear_storage: bool = True) -> int:
+    """
+    Restore a session state: unexpired cookies in one CDP Network.setCookies
+    command where available (one add_cookie per cookie otherwise, which only
+    accepts cookies of the current domain), then the web storage of each
+    saved origin with one script, navigating to the origin first when the
+    browser is elsewhere
+    :param driver: WebDriver
+    :param state: session state dict
+    :param clear_storage: clear the origin's storage before restoring
+    :return: number of cookies restored
+    """
+    now = time.time()
+    cookies = [
+        cookie
+        for cookie in state.get("cookies", ())
+        if cookie.get("expiry") is None or cookie["expiry"] > now
+    ]
+    storage = state.get("storage", {})
+    if cookies and _has_cdp(driver):
+        driver.execute_cdp_cmd(
+            "Network.setCookies", {"cookies": [_to_cdp(cookie) for cookie in cookies]}
+        )
+    elif cookies:
+        if storage:
+            _visit(driver, next(iter(storage)))
+        for cookie in cookies:
+            driver.add_cookie(cookie)
+    for origin, items in storage.items():
+        if not items["local"] and not items["session"] and not clear_storage:
+            continue
+        _visit(driver, origin)
+        driver.execute_script(
+            STORAGE_WRITE_SCRIPT, items["local"], items["session"], clear_storage
+        )
+    return len(cookies)
+
+
+def _visit(driver, origin: str) -> None:
+    """
+    Navigate to an origin unless the browser is already on it
+    :param driver: WebDriver
+    :param origin: scheme://host[:port]
+    :return: None
+    """
+    url = driver.current_url
+    if url != origin and not url.startswith(origin + "/"):
+        driver.get(origin)
+
+
+def write_state(path: str, state: dict) -> None:
+    """
+    Write a session state atomically, readable by the owner only
+    :param path: file path
+    :param state: session state dict
+    :return: None
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+            json.dump(state, file)
+        os.chmod(temporary, 0o600)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def read_state(path: str) -> Optional[dict]:
+    """
+    Read a session state
+    :param path: file path
+    :return: session state dict, or None when the file does not exist
+    """
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+class SessionCache:
+    """
+    On-disk session states keyed by role, so a suite logs in once per role
+    instead of once per test. Writes are atomic, so parallel workers sharing
+    ``directory`` never read a half-written state.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_age: Optional[float] = None,
+        required_cookies: Iterable[str] = (),
+    ):
+        self.directory = directory
+        self.max_age = max_age
+        self.required_cookies = tuple(required_cookies)
+
+    def path(self, role: str) -> str:
+        """
+        State file of a role
+        :param role: role name, e.g. "admin"
+        :return: file path
+        """
+        return os.path.join(self.directory, re.sub(r"[^\w.-]", "_", role) + ".json")
+
+    def save(
+        self,
+        driver,
+        role: str,
+        domains: Optional[Iterable[str]] = None,
+        origins: Iterable[str] = (),
+    ) -> None:
+        """
+        Save the current browser state for a role
+        :param driver: WebDriver
+        :param role: role name
+        :param domains: only keep cookies of these domains
+        :param origins: other origins whose web storage to save
+        :return: None
+        """
+        write_state(self.path(role), capture_session(driver, domains, origins))
+
+    def restore(self, driver, role: str) -> bool:
+        """
+        Restore the saved state of a role if it is still usable
+        :param driver: WebDriver
+        :param role: role name
+        :return: True when restored, False when missing or stale
+        """
+        state = read_state(self.path(role))
+        if state is None or session_problems(
+            state, self.max_age, self.required_cookies
+        ):
+            return False
+        apply_session(driver, state)
+        return True
+
+    def ensure(
+        self,
+        driver,
+        role: str,
+        login: Callable[[], None],
+        origins: Iterable[str] = (),
+    ) -> bool:
+        """
+        Restore a role's state, or log in with login() and save it
+        :param driver: WebDriver
+        :param role: role name
+        :param login: callable performing the login flow
+        :param origins: other origins whose web storage to save
+        :return: True when restored from the cache, False when logged in
+        """
+        if self.restore(driver, role):
+            return True
+        login()
+        self.save(driver, role, origins=origins)
+        return False
+
+    def invalidate(self, role: str) -> None:
+        """
+        Forget the saved state of a role
+        :param role: role name
+        :return: None
+        """
+        try:
+            os.remove(self.path(role))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,291 @@
+"""
+The Module records lookup and wait telemetry for ElementOperations.
+"""
+import atexit
+import csv
+import json
+import threading
+import time
+from typing import Optional
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.remote.webelement import WebElement
+
+# Upper bounds of the latency histogram buckets, in milliseconds; the last
+# bucket collects everything slower.
+BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class _Sample:
+    """
+    One measured operation, see Telemetry.measure().
+    """
+
+    __slots__ = ("polls", "outcome")
+
+    def __init__(self):
+        self.polls = 0
+        self.outcome = "hit"
+
+    def poll(self) -> None:
+        self.polls += 1
+
+
+class _NullSample:
+    """
+    Sample handed out when telemetry is disabled.
+    """
+
+    __slots__ = ()
+
+    def poll(self) -> None:
+        pass
+
+
+class _NullMeasurement:
+    """
+    Context manager that measures nothing.
+    """
+
+    def __enter__(self) -> _NullSample:
+        return _NULL_SAMPLE
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_SAMPLE = _NullSample()
+NO_MEASUREMENT = _NullMeasurement()
+
+
+class _Measurement:
+    """
+    Context manager timing one operation and recording it on exit.
+    """
+
+    def __init__(self, telemetry, operation: str, locator: str):
+        self.telemetry = telemetry
+        self.operation = operation
+        self.locator = locator
+        self.sample = _Sample()
+        self.started = None
+
+    def __enter__(self) -> _Sample:
+        self.started = time.perf_counter()
+        return self.sample
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        duration = (time.perf_counter() - self.started) * 1000
+        if exc_type is not None:
+            if issubclass(exc_type, TimeoutException):
+                self.sample.outcome = "timeout"
+            else:
+                self.sample.outcome = "error"
+        self.telemetry.record(
+            self.operation,
+            self.locator,
+            duration,
+            self.sample.polls,
+            self.sample.outcome,
+        )
+        return False
+
+
+class _Stats:
+    """
+    Aggregated measurements of one (operation, locator) pair.
+    """
+
+    __slots__ = (
+        "count",
+        "total_ms",
+        "min_ms",
+        "max_ms",
+        "polls",
+        "outcomes",
+        "buckets",
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = None
+        self.polls = 0
+        self.outcomes = {}
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, duration: float, polls: int, outcome: str) -> None:
+        self.count += 1
+        self.total_ms += duration
+        self.min_ms = duration if self.min_ms is None else min(self.min_ms, duration)
+        self.max_ms = duration if self.max_ms is None else max(self.max_ms, duration)
+        self.polls += polls
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        for index, bound in enumerate(BUCKETS_MS):
+            if duration <= bound:
+                self.buckets[index] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Approximate percentile: upper bound of the bucket holding it
+        :param fraction: 0.5 for the median
+        :return: milliseconds
+        """
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                return BUCKETS_MS[index] if index < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+
+class Telemetry:
+    """
+    Collects duration, poll count and outcome (hit, timeout or error) of
+    lookups and waits, aggregated into per-locator latency histograms.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def measure(self, operation: str, locator) -> _Measurement:
+        """
+        Time one operation
+        :param operation: operation name, e.g. "get_element"
+        :param locator: locator, formatted with format_locator()
+        :Example: with telemetry.measure("get_element", LOCATOR) as sample: ...
+        :return: context manager yielding a sample with poll() and outcome
+        """
+        return _Measurement(self, operation, format_locator(locator))
+
+    def record(
+        self, operation: str, locator: str, duration: float, polls: int, outcome: str
+    ) -> None:
+        """
+        Record one measurement
+        :param operation: operation name
+        :param locator: formatted locator
+        :param duration: milliseconds
+        :param polls: number of condition evaluations
+        :param outcome: "hit", "timeout" or "error"
+        :return: None
+        """
+        with self._lock:
+            key = (operation, locator)
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = _Stats()
+            stats.add(duration, polls, outcome)
+
+    def reset(self) -> None:
+        """
+        Forget every measurement
+        :return: None
+        """
+        with self._lock:
+            self._stats.clear()
+
+    def summary(self) -> list:
+        """
+        One row per (operation, locator), slowest total time first
+        :return: list of dicts
+        """
+        with self._lock:
+            items = list(self._stats.items())
+        rows = []
+        for (operation, locator), stats in items:
+            rows.append(
+                {
+                    "operation": operation,
+                    "locator": locator,
+                    "count": stats.count,
+                    "total_ms": stats.total_ms,
+                    "mean_ms": stats.total_ms / stats.count,
+                    "min_ms": stats.min_ms,
+                    "max_ms": stats.max_ms,
+                    "p50_ms": stats.percentile(0.5),
+                    "p90_ms": stats.percentile(0.9),
+                    "polls": stats.polls,
+                    "outcomes": dict(stats.outcomes),
+                    "histogram": dict(zip(_bucket_labels(), stats.buckets)),
+                }
+            )
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows
+
+    def dump_json(self, path: str) -> None:
+        """
+        Write the summary as JSON
+        :param path: file path
+        :return: None
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(
+                {"buckets_ms": list(BUCKETS_MS), "rows": self.summary()},
+                file,
+                indent=2,
+            )
+
+    def dump_csv(self, path: str) -> None:
+        """
+        Write the summary as CSV, one column per outcome and histogram bucket
+        :param path: file path
+        :return: None
+        """
+        rows = self.summary()
+        outcomes = sorted({name for row in rows for name in row["outcomes"]})
+        labels = _bucket_labels()
+        columns = ["operation", "locator", "count", "total_ms", "mean_ms"]
+        columns += ["min_ms", "max_ms", "p50_ms", "p90_ms", "polls"]
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(columns + outcomes + labels)
+            for row in rows:
+                writer.writerow(
+                    [row[column] for column in columns]
+                    + [row["outcomes"].get(name, 0) for name in outcomes]
+                    + [row["histogram"][label] for label in labels]
+                )
+
+    def dump_on_exit(self, path: str) -> None:
+        """
+        Dump the summary when the interpreter exits, CSV if path ends in .csv
+        :param path: file path
+        :return: None
+        """
+        if path.endswith(".csv"):
+            atexit.register(self.dump_csv, path)
+        else:
+            atexit.register(self.dump_json, path)
+
+
+def _bucket_labels() -> list:
+    """
+    Column names of the histogram buckets
+    :return: list of labels
+    """
+    return [f"le_{bound}ms" for bound in BUCKETS_MS] + [f"gt_{BUCKETS_MS[-1]}ms"]
+
+
+def format_locator(locator) -> str:
+    """
+    Readable key for a locator
+    :param locator: (By, value), frame index, WebElement or None
+    :return: str
+    """
+    if locator is None:
+        return "-"
+    if isinstance(locator, tuple) and len(locator) == 2:
+        return f"{locator[0]}={locator[1]}"
+    if isinstance(locator, WebElement):
+        # Element ids differ per session, keep them out of the key.
+        return "WebElement"
+    return str(locator)
@@ -0,0 +1,145 @@
+"""
+Benchmark of NetworkTracker against a recorded performance log.
+
+Compares the old eager read, which json-parsed every log entry, with
+collect(), a full get_network_traffic() and an early-stopping
+iter_network_traffic(). Without --log a synthetic 50k-entry log is
+generated: mostly Network.dataReceived and Page/Runtime noise, as a real
+page produces, with one response per ten entries.
+
+Usage: python benchmarks/iter_network_traffic.py [--log recorded.json]
+A recorded log is a JSON list of driver.get_log("performance") entries.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from SeleniumWise.network_tracker import NetworkTracker  # noqa: E402
+
+
+class ReplayDriver:
+    """
+    Driver stub returning a recorded performance log on the first read.
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+
+    def get_log(self, name):
+        entries, self.entries = self.entries, []
+        return entries
+
+
+def _entry(method, params, timestamp):
+    message = {"message": {"method": method, "params": params}, "webview": "1"}
+    return {"level": "INFO", "message": json.dumps(message), "timestamp": timestamp}
+
+
+def generate_log(count=50000, seed=1):
+    """
+    Synthetic performance log
+    :param count: number of entries
+    :param seed: random seed
+    :return: list of get_log("performance") entries
+    """
+    rng = random.Random(seed)
+    entries = []
+    timestamp = 1700000000000
+    for index in range(count):
+        timestamp += rng.randint(0, 3)
+        request_id = f"1000.{index // 10}"
+        if index % 10 == 0:
+            entries.append(
+                _entry(
+                    "Network.responseReceived",
+                    {
+                        "requestId": request_id,
+                        "type": rng.choice(["Document", "Script", "XHR", "Image"]),
+                        "response": {
+                            "url": f"https://example.test/asset/{index % 500}",
+                            "status": rng.choice([200, 200, 200, 304, 404]),
+                            "mimeType": "text/html",
+                            "headers": {"content-type": "text/html"},
+                            "timing": {"requestTime": 1.0, "sendStart": 0.5},
+                        },
+                    },
+                    timestamp,
+                )
+            )
+        elif index % 10 < 8:
+            entries.append(
+                _entry(
+                    "Network.dataReceived",
+                    {"requestId": request_id, "dataLength": 1024},
+                    timestamp,
+                )
+            )
+        else:
+            entries.append(
+                _entry("Page.frameStartedLoading", {"frameId": "F" * 32}, timestamp)
+            )
+    return entries
+
+
+def eager_read(entries):
+    """
+    The read every entry went through before the pending queue
+    :param entries: performance log
+    :return: network responses
+    """
+    messages = [json.loads(entry["message"])["message"] for entry in entries]
+    return [message for message in messages if "Network.response" in message["method"]]
+
+
+def _time(function, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--log", help="recorded performance log (JSON list)")
+    parser.add_argument("--entries", type=int, default=50000)
+    parser.add_argument("--first", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    if args.log:
+        with open(args.log, encoding="utf-8") as file:
+            log = json.load(file)
+    else:
+        log = generate_log(args.entries)
+
+    def collect():
+        return NetworkTracker(ReplayDriver(list(log))).collect()
+
+    def traffic():
+        return NetworkTracker(ReplayDriver(list(log))).get_network_traffic()
+
+    def first():
+        iterator = NetworkTracker(ReplayDriver(list(log))).iter_network_traffic()
+        return [message for _, message in zip(range(args.first), iterator)]
+
+    rows = [
+        ("eager json.loads of every entry", lambda: len(eager_read(log))),
+        ("collect()", collect),
+        ("get_network_traffic()", lambda: len(traffic())),
+        (f"iter_network_traffic(), first {args.first}", lambda: len(first())),
+    ]
+    print(f"{len(log)} log entries")
+    for name, function in rows:
+        elapsed, count = _time(function, args.repeat)
+        print(f"{name:<40} {elapsed:9.1f} ms  {count:>6} responses")
+
+
+if __name__ == "__main__":
+    main()
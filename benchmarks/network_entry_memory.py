@@ -0,0 +1,151 @@
+"""
+Memory and read cost of the NetworkTracker store.
+
+Measures with tracemalloc what the store retains for N synthetic
+Network.responseReceived events, once as the parsed CDP dicts the store
+used to keep and once as NetworkEntry records with their indexes and raw
+log text, with and without the parsed-event cache. Then times repeated
+get_network_traffic() calls, which are served from the cache for the most
+recent parsed_cache_size entries.
+
+Usage: python benchmarks/network_entry_memory.py [--entries 100000]
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from SeleniumWise.network_tracker import NetworkTracker  # noqa: E402
+
+
+class ReplayDriver:
+    """
+    Driver stub returning a performance log on the first read.
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+
+    def get_log(self, name):
+        entries, self.entries = self.entries, []
+        return entries
+
+
+def generate_log(count):
+    """
+    Synthetic performance log of responseReceived events
+    :param count: number of events
+    :return: list of get_log("performance") entries
+    """
+    entries = []
+    for index in range(count):
+        params = {
+            "requestId": f"1000.{index}",
+            "loaderId": "D" * 32,
+            "frameId": "F" * 32,
+            "timestamp": 1000.0 + index / 100,
+            "type": ("Document", "Script", "XHR", "Image")[index % 4],
+            "response": {
+                "url": f"https://example.test/asset/{index % 2000}",
+                "status": (200, 200, 304, 404)[index % 4],
+                "statusText": "OK",
+                "mimeType": "application/javascript",
+                "protocol": "h2",
+                "remoteIPAddress": "93.184.216.34",
+                "remotePort": 443,
+                "encodedDataLength": 512,
+                "headers": {
+                    "content-type": "application/javascript",
+                    "cache-control": "max-age=3600",
+                    "date": "Tue, 01 Oct 2024 10:00:00 GMT",
+                    "server": "example",
+                },
+                "timing": {
+                    "requestTime": 1000.0 + index / 100,
+                    "dnsStart": -1,
+                    "dnsEnd": -1,
+                    "connectStart": -1,
+                    "connectEnd": -1,
+                    "sendStart": 0.3,
+                    "sendEnd": 0.4,
+                    "receiveHeadersEnd": 25.0,
+                },
+            },
+        }
+        message = {
+            "message": {"method": "Network.responseReceived", "params": params},
+            "webview": "W" * 32,
+        }
+        entries.append(
+            {
+                "level": "INFO",
+                "message": json.dumps(message),
+                "timestamp": 1700000000000 + index,
+            }
+        )
+    return entries
+
+
+def retained(build):
+    """
+    Bytes still allocated by what build() returns
+    :param build: callable building the structure to measure
+    :return: (bytes, structure)
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    structure = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, structure
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=100000)
+    parser.add_argument("--traffic-entries", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    log = generate_log(args.entries)
+    text_bytes = sum(sys.getsizeof(entry["message"]) for entry in log)
+    print(f"{args.entries} responseReceived events")
+    size, _ = retained(
+        lambda: [json.loads(entry["message"])["message"] for entry in log]
+    )
+    print(f"{'parsed CDP dicts':<44} {size / 2**20:8.1f} MB")
+    for cache in (0, 10000):
+
+        def build():
+            tracker = NetworkTracker(ReplayDriver(list(log)), parsed_cache_size=cache)
+            tracker.collect()
+            return tracker
+
+        size, _ = retained(build)
+        label = f"records + indexes, parsed_cache_size={cache}"
+        print(f"{label:<44} {size / 2**20:8.1f} MB")
+    print(f"{'plus the raw log text they keep':<44} {text_bytes / 2**20:8.1f} MB")
+
+    print(f"\nget_network_traffic() over {args.traffic_entries} entries")
+    log = log[: args.traffic_entries]
+    for cache in (0, args.traffic_entries // 2, args.traffic_entries):
+        tracker = NetworkTracker(ReplayDriver(list(log)), parsed_cache_size=cache)
+        tracker.collect()
+        best = float("inf")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            tracker.get_network_traffic()
+            best = min(best, time.perf_counter() - started)
+        label = f"parsed_cache_size={cache}"
+        print(f"{label:<44} {best * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Per-step cost of screenshots on the test thread.
+
+Takes one screenshot per simulated test step, first with the synchronous
+Navigation.get_screenshot_as_file and then with capture_screenshot and the
+background ScreenshotPipeline, and reports the time each step spends in the
+call, plus the time until every file is on disk.
+
+Without --browser a driver stub answers the screenshot command after
+--latency milliseconds with a --size KB image; --changing sets the share of
+steps whose image differs from the previous one, the rest are duplicates
+the pipeline skips. With --browser chrome or firefox a headless browser
+renders a page that changes on every step (needs the browser and driver).
+
+Usage: python benchmarks/screenshot_overhead.py [--steps 100] [--browser chrome]
+"""
+import argparse
+import base64
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from SeleniumWise.navigation import Navigation  # noqa: E402
+
+
+class ScreenshotDriver:
+    """
+    Driver stub with a fixed screenshot round-trip; the file helpers are the
+    real WebDriver ones, so the synchronous path decodes and writes as usual.
+    """
+
+    get_screenshot_as_png = WebDriver.get_screenshot_as_png
+    get_screenshot_as_file = WebDriver.get_screenshot_as_file
+
+    def __init__(self, latency, size, changing, seed=1):
+        self.latency = latency
+        self.changing = changing
+        self._random = random.Random(seed)
+        self._size = size
+        self._image = self._new_image()
+
+    def _new_image(self):
+        return base64.b64encode(self._random.randbytes(self._size)).decode("ascii")
+
+    def get_screenshot_as_base64(self):
+        time.sleep(self.latency)
+        if self._random.random() < self.changing:
+            self._image = self._new_image()
+        return self._image
+
+    def step(self, index):
+        pass
+
+
+class BrowserDriver:
+    """
+    Headless browser showing a page that changes on every step.
+    """
+
+    def __init__(self, name):
+        from selenium import webdriver
+
+        if name == "chrome":
+            options = webdriver.ChromeOptions()
+            options.add_argument("--headless=new")
+            self.driver = webdriver.Chrome(options=options)
+        else:
+            options = webdriver.FirefoxOptions()
+            options.add_argument("-headless")
+            self.driver = webdriver.Firefox(options=options)
+        self.driver.set_window_size(1280, 1024)
+        self.driver.get("data:text/html,<h1 id='step'>0</h1>")
+
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+    def step(self, index):
+        self.driver.execute_script(
+            "document.getElementById('step').textContent = arguments[0]", index
+        )
+
+
+def run(navigation, driver, steps, directory, pipelined):
+    """
+    Take one screenshot per step
+    :return: (per-step seconds, seconds until every file is written)
+    """
+    durations = []
+    started = time.perf_counter()
+    for index in range(steps):
+        driver.step(index)
+        filename = os.path.join(directory, f"step-{index}.png")
+        before = time.perf_counter()
+        if pipelined:
+            navigation.capture_screenshot(filename)
+        else:
+            navigation.get_screenshot_as_file(filename)
+        durations.append(time.perf_counter() - before)
+    if pipelined:
+        navigation.screenshot_pipeline.flush()
+    return durations, time.perf_counter() - started
+
+
+def report(name, durations, total):
+    durations = sorted(durations)
+    p95 = durations[int(len(durations) * 0.95) - 1]
+    print(
+        f"{name:<28} mean {statistics.mean(durations) * 1000:7.2f} ms"
+        f"  p95 {p95 * 1000:7.2f} ms  total {total:6.2f} s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--browser", choices=("chrome", "firefox"))
+    parser.add_argument("--latency", type=float, default=40, help="stub, ms")
+    parser.add_argument("--size", type=int, default=600, help="stub, KB")
+    parser.add_argument("--changing", type=float, default=0.5, help="stub")
+    args = parser.parse_args()
+    if args.browser:
+        driver = BrowserDriver(args.browser)
+    else:
+        driver = ScreenshotDriver(args.latency / 1000, args.size * 1024, args.changing)
+    navigation = Navigation(driver)
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            durations, total = run(navigation, driver, args.steps, directory, False)
+            report("get_screenshot_as_file", durations, total)
+        with tempfile.TemporaryDirectory() as directory:
+            navigation.enable_screenshot_pipeline()
+            durations, total = run(navigation, driver, args.steps, directory, True)
+            report("capture_screenshot", durations, total)
+            print(navigation.screenshot_pipeline.stats())
+            navigation.disable_screenshot_pipeline()
+    finally:
+        if args.browser:
+            driver.quit()
+
+
+if __name__ == "__main__":
+    main()